@@ -0,0 +1,193 @@
+"""
+Async API Client Module
+aiohttp-based variants of the weather and news requests, so several
+lookups can run concurrently with asyncio.gather
+"""
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional, the sync API classes do not need it
+    aiohttp = None
+
+from api.http_session import (REQUEST_TIMEOUT, RETRIES, BACKOFF_FACTOR, RETRY_STATUSES,
+                              RETRY_AFTER_STATUSES, retry_delay)
+from api.weather_api import WeatherAPI
+from api.news_api import NewsAPI, ARTICLE_FIELDS
+
+ASYNC_AVAILABLE = aiohttp is not None
+
+# Concurrent NYT searches allowed at once, the API is rate limited per key
+NEWS_CONCURRENCY = 5
+
+# Concurrent OpenWeatherMap requests allowed at once
+WEATHER_CONCURRENCY = 10
+
+class AsyncAPIClient:
+    """Async client sharing one aiohttp session for all requests"""
+
+    def __init__(self, weather_api=None, news_api=None, retries=RETRIES, backoff_factor=BACKOFF_FACTOR):
+        """Initialize async API client
+
+        Args:
+            weather_api: WeatherAPI used for keys, requests, caching and parsing, created if None
+            news_api: NewsAPI used for keys, requests, caching and formatting, created if None
+            retries: Number of retries for transient errors, as for the requests session
+            backoff_factor: Backoff factor between retries
+        """
+        if not ASYNC_AVAILABLE:
+            raise ImportError("aiohttp is required for async requests, please run: pip install aiohttp")
+
+        self.weather_api = weather_api or WeatherAPI()
+        self.news_api = news_api or NewsAPI()
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self):
+        """Get the long-lived session, created on first use inside the running loop"""
+        if self._session is None or self._session.closed:
+            connect_timeout, read_timeout = REQUEST_TIMEOUT
+            timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+            self._session = aiohttp.ClientSession(timeout=timeout)
+        return self._session
+
+    async def close(self):
+        """Close the underlying session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _send(self, request):
+        """Get a response from the API cache or with the aiohttp session
+
+        Transient errors are retried with the same policy as the requests
+        session used by the sync API classes.
+
+        Args:
+            request: CachedRequest built by WeatherAPI or NewsAPI
+
+        Returns:
+            dict: Response data, returns None if failed
+        """
+        data = request.cached()
+        if data is not None:
+            return data
+
+        for retry_number in range(1, self.retries + 2):
+            last_try = retry_number > self.retries
+            retry_after = None
+            try:
+                async with self._get_session().get(request.endpoint, params=request.params,
+                                                   headers=request.headers) as response:
+                    if last_try or response.status not in RETRY_STATUSES:
+                        return request.finish(response.status, response.headers, await response.read())
+                    if response.status in RETRY_AFTER_STATUSES:
+                        retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if last_try:
+                    return request.fail(e)
+            except Exception as e:
+                return request.fail(e)
+            await asyncio.sleep(retry_delay(retry_number, self.backoff_factor, retry_after))
+
+    async def get_current_weather(self, location, units="metric"):
+        """Get current weather for specified location
+
+        Returns:
+            dict: Raw weather data, returns None if failed
+        """
+        if not self.weather_api.api_key:
+            return None
+        return await self._send(self.weather_api.cached_request('current', location, units))
+
+    async def get_forecast(self, location, days=5, units="metric"):
+        """Get weather forecast for specified location
+
+        Returns:
+            dict: Raw forecast data, returns None if failed
+        """
+        if not self.weather_api.api_key:
+            return None
+        return await self._send(self.weather_api.cached_request('forecast', location, units))
+
+    async def get_current_weather_bulk(self, locations, units="metric"):
+        """Get current weather for several locations concurrently
+
+        Args:
+            locations: Iterable of location names, coordinates or postal codes
+            units: Unit system
+
+        Returns:
+            dict: Location -> raw weather data (None if failed)
+        """
+        locations = list(dict.fromkeys(locations))
+        semaphore = asyncio.Semaphore(WEATHER_CONCURRENCY)
+
+        async def fetch(location):
+            async with semaphore:
+                return await self.get_current_weather(location, units)
+
+        results = await asyncio.gather(*(fetch(location) for location in locations))
+        return dict(zip(locations, results))
+
+    async def search_articles(self, query, begin_date=None, end_date=None, sort="newest", page=0, fl=ARTICLE_FIELDS):
+        """Search for articles related to the specified query
+
+        Returns:
+            dict: Raw search result, returns None if failed
+        """
+        if not self.news_api.api_key:
+            return None
+        return await self._send(self.news_api.cached_request(query, begin_date, end_date, sort, page, fl))
+
+    async def get_location_news(self, location, limit=5):
+        """Get news related to specified location
+
+        Returns:
+            list: List containing news information, returns empty list if failed
+        """
+        result = await self.search_articles(location)
+        return self.news_api.format_articles(result, limit)
+
+    async def get_location_news_bulk(self, locations, limit=5):
+        """Get news for several locations concurrently
+
+        Args:
+            locations: Iterable of location names
+            limit: Number of news items per location
+
+        Returns:
+            dict: Location name -> list of news items
+        """
+        locations = list(dict.fromkeys(locations))
+        semaphore = asyncio.Semaphore(NEWS_CONCURRENCY)
+
+        async def fetch(location):
+            async with semaphore:
+                return await self.get_location_news(location, limit)
+
+        results = await asyncio.gather(*(fetch(location) for location in locations))
+        return dict(zip(locations, results))
+
+def run_sync(call):
+    """Run an async client call from synchronous code
+
+    Args:
+        call: Function taking an AsyncAPIClient and returning a coroutine,
+              e.g. lambda client: client.get_current_weather("Beijing")
+
+    Returns:
+        Result of the coroutine
+    """
+    async def runner():
+        async with AsyncAPIClient() as client:
+            return await call(client)
+
+    return asyncio.run(runner())
@@ -0,0 +1,159 @@
+"""
+Cached Request Module
+Cache lookup, conditional revalidation and stale fallback shared by the
+requests-based API classes and the aiohttp client
+"""
+import logging
+
+from api.http_session import REQUEST_TIMEOUT
+from json_codec import loads
+
+logger = logging.getLogger(__name__)
+
+# ETag / Last-Modified validators are kept this long for conditional requests
+VALIDATOR_TTL = 86400
+
+class CachedRequest:
+    """One API request going through the response cache
+
+    send() runs it on a requests session. Other HTTP clients, such as the
+    aiohttp client, follow the same steps themselves:
+
+        data = request.cached()
+        if data is None:
+            response = <GET request.endpoint with request.params and request.headers>
+            data = request.finish(status, response headers, raw body)
+
+    with request.fail(error) instead of finish() when the call raises.
+    """
+
+    def __init__(self, cache, cache_key, endpoint, params, ttl, error_message, label, cache_fallback=True):
+        """Initialize cached request
+
+        Args:
+            cache: Response cache
+            cache_key: Key of the cached response
+            endpoint: Request URL
+            params: Query parameters
+            ttl: Cache lifetime of a fresh response in seconds
+            error_message: Message logged when the API answers with an error
+            label: What the response holds (weather, news), used in log messages
+            cache_fallback: Return the last cached response (even if expired) when the request fails
+        """
+        self.cache = cache
+        self.cache_key = cache_key
+        self.endpoint = endpoint
+        self.params = params
+        self.ttl = ttl
+        self.error_message = error_message
+        self.label = label
+        self.cache_fallback = cache_fallback
+        self.headers = None
+        self._stale = None
+
+    @property
+    def validators_key(self):
+        """Cache key of the ETag / Last-Modified validators"""
+        return self.cache_key + ":validators"
+
+    def cached(self):
+        """Get the cached response while it is fresh
+
+        When it has expired but validators were stored with it, prepares the
+        If-None-Match / If-Modified-Since headers, so an unchanged payload
+        comes back as a small 304 and is not parsed again.
+
+        Returns:
+            dict: Cached response, returns None if a request is needed
+        """
+        data = self.cache.get(self.cache_key)
+        if data is not None:
+            return data
+
+        validators = self.cache.get(self.validators_key)
+        if validators:
+            # Held from here on, so a 304 can be answered even if the entry is evicted meanwhile
+            self._stale = self.cache.get(self.cache_key, allow_stale=True)
+        if self._stale is not None:
+            headers = {}
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+            self.headers = headers or None
+        return None
+
+    def send(self, session, timeout=REQUEST_TIMEOUT):
+        """Get the response from the cache or with a requests session
+
+        Args:
+            session: requests.Session, retries transient errors itself
+            timeout: (connect, read) timeout in seconds
+
+        Returns:
+            dict: Response data, returns None if failed
+        """
+        data = self.cached()
+        if data is not None:
+            return data
+
+        try:
+            response = session.get(self.endpoint, params=self.params, headers=self.headers, timeout=timeout)
+            return self.finish(response.status_code, response.headers, response.content)
+        except Exception as e:
+            return self.fail(e)
+
+    def finish(self, status, headers, body):
+        """Handle the API response
+
+        Args:
+            status: HTTP status code
+            headers: Response headers
+            body: Raw response body
+
+        Returns:
+            dict: Response data, returns the stale fallback (or None) if failed
+        """
+        if status == 304 and self._stale is not None:
+            self.cache.set(self.cache_key, self._stale, self.ttl)
+            return self._stale
+        if status == 200:
+            data = loads(body)
+            self.cache.set(self.cache_key, data, self.ttl)
+            self._store_validators(headers)
+            return data
+
+        logger.warning("%s: %s - %s", self.error_message, status, body.decode('utf-8', 'replace'))
+        return self.fallback()
+
+    def fail(self, error):
+        """Handle a request that raised
+
+        Returns:
+            dict: Stale fallback, returns None if there is none
+        """
+        logger.warning("Error requesting %s API: %s", self.label, error)
+        return self.fallback()
+
+    def fallback(self):
+        """Get the last cached response after a failed request
+
+        Returns:
+            dict: Stale response, returns None if fallback is disabled or nothing is cached
+        """
+        if not self.cache_fallback:
+            return None
+
+        stale = self._stale
+        if stale is None:
+            stale = self.cache.get(self.cache_key, allow_stale=True)
+        if stale is not None:
+            logger.warning("Using cached %s data", self.label)
+        return stale
+
+    def _store_validators(self, headers):
+        """Remember the ETag / Last-Modified of a response for the next revalidation"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if etag or last_modified:
+            self.cache.set(self.validators_key, {'etag': etag, 'last_modified': last_modified}, VALIDATOR_TTL)
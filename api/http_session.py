@@ -0,0 +1,83 @@
+"""
+HTTP Session Module
+Builds the shared requests session used by the API interfaces
+"""
+from types import MappingProxyType
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+# (connect, read) timeout in seconds for every API request
+REQUEST_TIMEOUT = (5, 10)
+
+# Transient upstream errors worth retrying
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Default retry policy: retries per request and the exponential backoff factor
+RETRIES = 3
+BACKOFF_FACTOR = 0.3
+
+# Longest backoff between retries in seconds, as in urllib3
+BACKOFF_MAX = 120
+
+# Statuses whose Retry-After header is honoured, as in urllib3
+RETRY_AFTER_STATUSES = (429, 503)
+
+# Shared read-only default for missing sections of API responses
+EMPTY = MappingProxyType({})
+
+def create_session(pool_connections=4, pool_maxsize=20, retries=RETRIES, backoff_factor=BACKOFF_FACTOR):
+    """Create a requests session with connection pooling and retries
+
+    Reusing one session keeps connections alive between calls, so repeated
+    requests to the same host skip the TCP and TLS handshakes.
+
+    Args:
+        pool_connections: Number of host pools to cache
+        pool_maxsize: Maximum number of connections kept per host
+        retries: Number of retries for failed GET requests
+        backoff_factor: Backoff factor between retries
+
+    Returns:
+        requests.Session: Configured session
+    """
+    session = requests.Session()
+    # Advertise every compression urllib3 can decode here; brotli ("br") is
+    # included once the brotli package is installed
+    session.headers['Accept-Encoding'] = make_headers(accept_encoding=True)['accept-encoding']
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=("GET",),
+        raise_on_status=False  # hand the last response back to the caller's status handling
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def retry_delay(retry_number, backoff_factor=BACKOFF_FACTOR, retry_after=None):
+    """Seconds to wait before a retry, following urllib3's Retry backoff
+
+    Used by clients that retry on their own, so they back off like the
+    requests session does.
+
+    Args:
+        retry_number: 1 for the first retry, 2 for the second, ...
+        backoff_factor: Backoff factor between retries
+        retry_after: Retry-After header value of the failed response, if any
+
+    Returns:
+        float: Delay in seconds
+    """
+    if retry_after:
+        try:
+            return max(float(retry_after), 0.0)
+        except ValueError:
+            pass  # HTTP-date form, fall back to the exponential backoff
+    if retry_number <= 1:
+        return 0.0
+    return min(backoff_factor * 2 ** (retry_number - 1), BACKOFF_MAX)
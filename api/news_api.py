@@ -2,24 +2,45 @@
 News API Interface Module
 Used to interact with New York Times API to get news data
 """
-import requests
+import logging
 import os
-from datetime import datetime
+
+from api.cached_request import CachedRequest
+from api.http_session import EMPTY, create_session
+from cache import create_cache
+
+logger = logging.getLogger(__name__)
+
+# Cache lifetime in seconds for article search results
+NEWS_CACHE_TTL = 600
+
+# Article fields used by format_articles, requested via the NYT "fl" parameter
+ARTICLE_FIELDS = 'headline,abstract,web_url,source,pub_date,section_name'
+
+# Shared across instances so connections stay alive between calls
+_session = create_session()
+_cache = create_cache()
 
 class NewsAPI:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, session=None, cache=None, cache_fallback=True):
         """Initialize News API interface
         
         Args:
             api_key: New York Times API key, if None tries to get from environment variables
+            session: requests.Session to use, if None uses the module-level shared session
+            cache: Response cache to use, if None uses the module-level shared cache
+            cache_fallback: Return the last cached result (even if expired) when a request fails
         """
         self.api_key = api_key or os.environ.get('NYT_API_KEY') or "qn9lfPgRwicJ67dRV4es4JRgD2jGuVDq"
         if not self.api_key:
-            print("Warning: New York Times API key not set, please set NYT_API_KEY environment variable or provide during initialization")
+            logger.warning("New York Times API key not set, please set NYT_API_KEY environment variable or provide during initialization")
         
         self.base_url = "https://api.nytimes.com/svc"
+        self.session = session or _session
+        self.cache = cache or _cache
+        self.cache_fallback = cache_fallback
     
-    def search_articles(self, query, begin_date=None, end_date=None, sort="newest", page=0):
+    def search_articles(self, query, begin_date=None, end_date=None, sort="newest", page=0, fl=ARTICLE_FIELDS):
         """Search for articles related to the specified query
         
         Args:
@@ -28,6 +49,7 @@ class NewsAPI:
             end_date: End date (YYYYMMDD format)
             sort: Sort method (newest, oldest, relevance)
             page: Page number
+            fl: Comma separated article fields to return, None returns all fields
             
         Returns:
             dict: Dictionary containing article information, returns None if failed
@@ -35,6 +57,31 @@ class NewsAPI:
         if not self.api_key:
             return None
             
+        return self.cached_request(query, begin_date, end_date, sort, page, fl).send(self.session)
+    
+    def cached_request(self, query, begin_date=None, end_date=None, sort="newest", page=0, fl=ARTICLE_FIELDS):
+        """Build the cached request for an article search
+        
+        The aiohttp client sends the same request on its own session, so
+        both share the cache and fallback rules.
+        
+        Returns:
+            CachedRequest: Request going through this API's response cache
+        """
+        endpoint, params = self._build_search_request(query, begin_date, end_date, sort, page, fl)
+        return CachedRequest(self.cache, self._cache_key(query, begin_date, end_date, sort, page, fl),
+                             endpoint, params, NEWS_CACHE_TTL, "Failed to get news data", 'news', self.cache_fallback)
+    
+    def _cache_key(self, query, begin_date=None, end_date=None, sort="newest", page=0, fl=ARTICLE_FIELDS):
+        """Build the cache key for an article search"""
+        return f"nyt:search:{query.lower().strip()}:{begin_date}:{end_date}:{sort}:{page}:{fl}"
+    
+    def _build_search_request(self, query, begin_date=None, end_date=None, sort="newest", page=0, fl=ARTICLE_FIELDS):
+        """Build the article search URL and query parameters
+        
+        Returns:
+            tuple: (endpoint, params)
+        """
         endpoint = f"{self.base_url}/search/v2/articlesearch.json"
         params = {
             'q': query,
@@ -47,17 +94,10 @@ class NewsAPI:
             params['begin_date'] = begin_date
         if end_date:
             params['end_date'] = end_date
+        if fl:
+            params['fl'] = fl
         
-        try:
-            response = requests.get(endpoint, params=params)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"Failed to get news data: {response.status_code} - {response.text}")
-                return None
-        except Exception as e:
-            print(f"Error when requesting News API: {e}")
-            return None
+        return endpoint, params
     
     def get_location_news(self, location, limit=5):
         """Get news related to specified location
@@ -70,21 +110,29 @@ class NewsAPI:
             list: List containing news information, returns empty list if failed
         """
         result = self.search_articles(location)
+        return self.format_articles(result, limit)
+    
+    def format_articles(self, result, limit=5):
+        """Format raw search results into application format
+        
+        Args:
+            result: Raw search result from API
+            limit: Number of news items to return
+            
+        Returns:
+            list: List containing news information, returns empty list if no articles
+        """
         if not result or 'response' not in result or 'docs' not in result['response']:
             return []
         
-        articles = result['response']['docs'][:limit]
-        formatted_articles = []
-        
-        for article in articles:
-            formatted_article = {
-                'title': article.get('headline', {}).get('main', 'Unknown Title'),
+        return [
+            {
+                'title': (article.get('headline') or EMPTY).get('main', 'Unknown Title'),
                 'abstract': article.get('abstract', 'No abstract'),
                 'url': article.get('web_url', ''),
                 'source': article.get('source', 'New York Times'),
                 'published_date': article.get('pub_date', ''),
                 'section': article.get('section_name', 'Uncategorized')
             }
-            formatted_articles.append(formatted_article)
-        
-        return formatted_articles
+            for article in result['response']['docs'][:limit]
+        ]
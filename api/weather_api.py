@@ -2,22 +2,121 @@
 Weather API Interface Module
 For interacting with OpenWeatherMap API to get weather data
 """
-import requests
+import logging
 import os
+import re
 from datetime import datetime
+from functools import lru_cache
+
+from api.cached_request import CachedRequest
+from api.http_session import EMPTY, create_session
+from cache import create_cache
+
+logger = logging.getLogger(__name__)
+
+# Cache lifetimes in seconds: current weather changes within minutes, forecasts within hours
+CURRENT_CACHE_TTL = 60
+FORECAST_CACHE_TTL = 1800
+
+# Request kind -> (API path, cache lifetime, message logged when the API answers with an error)
+_REQUEST_KINDS = {
+    'current': ('weather', CURRENT_CACHE_TTL, "Failed to get weather data"),
+    'forecast': ('forecast', FORECAST_CACHE_TTL, "Failed to get weather forecast"),
+}
+
+# Location input formats: "lat,lon" coordinates and numeric postal codes
+_COORD_RE = re.compile(r'\s*-?\d+(?:\.\d+)?\s*,\s*-?\d+(?:\.\d+)?\s*')
+_ZIP_RE = re.compile(r'\d+')
+
+_WIND_DIRECTIONS = ("North", "Northeast", "East", "Southeast", "South", "Southwest", "West", "Northwest")
+# Direction for every whole degree, so lookups skip the division and rounding
+_WIND_DIRECTIONS_BY_DEGREE = tuple(_WIND_DIRECTIONS[round(d / 45) % 8] for d in range(360))
+
+# Shared across instances so connections stay alive between calls
+_session = create_session()
+_cache = create_cache()
+
+# (result key, path in the current weather response, default) for fields copied as-is
+_CURRENT_FIELDS = (
+    ('location', ('name',), 'Unknown'),
+    ('country', ('sys', 'country'), ''),
+    ('latitude', ('coord', 'lat'), None),
+    ('longitude', ('coord', 'lon'), None),
+    ('temperature', ('main', 'temp'), None),
+    ('feels_like', ('main', 'feels_like'), None),
+    ('humidity', ('main', 'humidity'), None),
+    ('pressure', ('main', 'pressure'), None),
+    ('wind_speed', ('wind', 'speed'), None),
+    ('clouds', ('clouds', 'all'), None),
+    ('weather_condition', ('weather', 0, 'main'), 'Unknown'),
+    ('weather_description', ('weather', 0, 'description'), 'Unknown'),
+    ('weather_icon', ('weather', 0, 'icon'), None),
+    ('timestamp', ('dt',), None),
+)
+
+def _dig(data, path, default=None):
+    """Walk a path of keys/indexes into nested API data
+    
+    Args:
+        data: Decoded JSON data
+        path: Tuple of dict keys and list indexes
+        default: Value returned when any step is missing
+    """
+    for key in path:
+        try:
+            data = data[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+    return data
+
+@lru_cache(maxsize=1024)
+def _classify_location(location):
+    """Get the query parameters identifying a location
+    
+    Args:
+        location: Location name, coordinates or postal code
+        
+    Returns:
+        tuple: (name, value) parameter pairs
+    """
+    # Check if location is in coordinate format
+    if _COORD_RE.fullmatch(location):
+        lat, lon = location.split(',')
+        return (('lat', lat.strip()), ('lon', lon.strip()))
+    # Check if location is in postal code format
+    if _ZIP_RE.fullmatch(location):
+        return (('zip', location),)
+    return (('q', location),)
+
+def is_place_name(location):
+    """Check whether a location is a place name rather than coordinates or a postal code"""
+    return _classify_location(location)[0][0] == 'q'
+
+def format_time(timestamp):
+    """Format a unix timestamp as local HH:MM:SS
+    
+    Parsed forecasts keep raw timestamps; call this when displaying them.
+    """
+    return datetime.fromtimestamp(timestamp).time().isoformat('seconds')
 
 class WeatherAPI:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, session=None, cache=None, cache_fallback=True):
         """Initialize weather API interface
         
         Args:
             api_key: OpenWeatherMap API key, if None will try to get from environment variables
+            session: requests.Session to use, if None uses the module-level shared session
+            cache: Response cache to use, if None uses the module-level shared cache
+            cache_fallback: Return the last cached response (even if expired) when a request fails
         """
         self.api_key = api_key or os.environ.get('OPENWEATHER_API_KEY') or "99f286c0e5f8d87ab3b51207174c6547"
         if not self.api_key:
-            print("Warning: OpenWeatherMap API key not set, please set OPENWEATHER_API_KEY environment variable or provide during initialization")
+            logger.warning("OpenWeatherMap API key not set, please set OPENWEATHER_API_KEY environment variable or provide during initialization")
         
         self.base_url = "https://api.openweathermap.org/data/2.5"
+        self.session = session or _session
+        self.cache = cache or _cache
+        self.cache_fallback = cache_fallback
     
     def get_current_weather(self, location, units="metric"):
         """Get current weather for specified location
@@ -32,29 +131,7 @@ class WeatherAPI:
         if not self.api_key:
             return None
             
-        # Check if location is in coordinate format
-        if ',' in location and all(part.replace('.', '', 1).replace('-', '', 1).isdigit() 
-                                  for part in location.split(',')):
-            lat, lon = location.split(',')
-            endpoint = f"{self.base_url}/weather?lat={lat.strip()}&lon={lon.strip()}"
-        # Check if location is in postal code format
-        elif location.isdigit():
-            endpoint = f"{self.base_url}/weather?zip={location}"
-        else:
-            endpoint = f"{self.base_url}/weather?q={location}"
-            
-        endpoint += f"&appid={self.api_key}&units={units}&lang=en"
-        
-        try:
-            response = requests.get(endpoint)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"Failed to get weather data: {response.status_code} - {response.text}")
-                return None
-        except Exception as e:
-            print(f"Error requesting weather API: {e}")
-            return None
+        return self.cached_request('current', location, units).send(self.session)
     
     def get_forecast(self, location, days=5, units="metric"):
         """Get weather forecast for specified location
@@ -70,29 +147,51 @@ class WeatherAPI:
         if not self.api_key:
             return None
             
-        # Check if location is in coordinate format
-        if ',' in location and all(part.replace('.', '', 1).replace('-', '', 1).isdigit() 
-                                  for part in location.split(',')):
-            lat, lon = location.split(',')
-            endpoint = f"{self.base_url}/forecast?lat={lat.strip()}&lon={lon.strip()}"
-        # Check if location is in postal code format
-        elif location.isdigit():
-            endpoint = f"{self.base_url}/forecast?zip={location}"
-        else:
-            endpoint = f"{self.base_url}/forecast?q={location}"
-            
-        endpoint += f"&appid={self.api_key}&units={units}&lang=en"
+        return self.cached_request('forecast', location, units).send(self.session)
+    
+    def cached_request(self, kind, location, units="metric"):
+        """Build the cached request for a weather lookup
+        
+        The aiohttp client sends the same request on its own session, so
+        both share the cache, revalidation and fallback rules.
+        
+        Args:
+            kind: Request kind (current, forecast)
+            location: Location name, coordinates or postal code
+            units: Temperature units
+            
+        Returns:
+            CachedRequest: Request going through this API's response cache
+        """
+        path, ttl, error_message = _REQUEST_KINDS[kind]
+        endpoint, params = self._build_request(path, location, units)
+        return CachedRequest(self.cache, self._cache_key(kind, location, units), endpoint, params,
+                             ttl, error_message, 'weather', self.cache_fallback)
+    
+    def _cache_key(self, kind, location, units):
+        """Build the cache key for a request
         
-        try:
-            response = requests.get(endpoint)
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"Failed to get weather forecast: {response.status_code} - {response.text}")
-                return None
-        except Exception as e:
-            print(f"Error requesting weather API: {e}")
-            return None
+        Args:
+            kind: Request kind (current, forecast)
+            location: Location name, coordinates or postal code
+            units: Temperature units
+        """
+        return f"owm:{kind}:{location.lower().strip()}:{units}"
+    
+    def _build_request(self, path, location, units):
+        """Build the request URL and query parameters for a location
+        
+        Args:
+            path: API path (weather, forecast)
+            location: Location name, coordinates or postal code
+            units: Temperature units
+            
+        Returns:
+            tuple: (endpoint, params)
+        """
+        params = {'appid': self.api_key, 'units': units, 'lang': 'en'}
+        params.update(_classify_location(location))
+        return f"{self.base_url}/{path}", params
     
     def parse_weather_data(self, weather_data):
         """Parse weather data into application format
@@ -108,30 +207,17 @@ class WeatherAPI:
             
         try:
             # Extract main weather information
-            result = {
-                'location': weather_data.get('name', 'Unknown'),
-                'country': weather_data.get('sys', {}).get('country', ''),
-                'latitude': weather_data.get('coord', {}).get('lat'),
-                'longitude': weather_data.get('coord', {}).get('lon'),
-                'temperature': weather_data.get('main', {}).get('temp'),
-                'feels_like': weather_data.get('main', {}).get('feels_like'),
-                'humidity': weather_data.get('main', {}).get('humidity'),
-                'pressure': weather_data.get('main', {}).get('pressure'),
-                'wind_speed': weather_data.get('wind', {}).get('speed'),
-                'wind_direction': self._get_wind_direction(weather_data.get('wind', {}).get('deg')),
-                'clouds': weather_data.get('clouds', {}).get('all'),
-                'weather_condition': weather_data.get('weather', [{}])[0].get('main', 'Unknown'),
-                'weather_description': weather_data.get('weather', [{}])[0].get('description', 'Unknown'),
-                'weather_icon': weather_data.get('weather', [{}])[0].get('icon'),
-                'timestamp': weather_data.get('dt'),
-                'date': datetime.fromtimestamp(weather_data.get('dt', 0)).strftime('%Y-%m-%d'),
-                'time': datetime.fromtimestamp(weather_data.get('dt', 0)).strftime('%H:%M:%S'),
-                'sunrise': datetime.fromtimestamp(weather_data.get('sys', {}).get('sunrise', 0)).strftime('%H:%M:%S'),
-                'sunset': datetime.fromtimestamp(weather_data.get('sys', {}).get('sunset', 0)).strftime('%H:%M:%S')
-            }
+            result = {key: _dig(weather_data, path, default) for key, path, default in _CURRENT_FIELDS}
+            
+            observed = datetime.fromtimestamp(weather_data.get('dt', 0))
+            result['wind_direction'] = self._get_wind_direction(_dig(weather_data, ('wind', 'deg')))
+            result['date'] = observed.date().isoformat()
+            result['time'] = observed.time().isoformat('seconds')
+            result['sunrise'] = format_time(_dig(weather_data, ('sys', 'sunrise'), 0))
+            result['sunset'] = format_time(_dig(weather_data, ('sys', 'sunset'), 0))
             return result
         except Exception as e:
-            print(f"Error parsing weather data: {e}")
+            logger.warning("Error parsing weather data: %s", e)
             return None
     
     def parse_forecast_data(self, forecast_data):
@@ -148,14 +234,16 @@ class WeatherAPI:
             
         try:
             # Extract city information
+            city = forecast_data.get('city') or EMPTY
+            coord = city.get('coord') or EMPTY
             city_info = {
-                'name': forecast_data.get('city', {}).get('name', 'Unknown'),
-                'country': forecast_data.get('city', {}).get('country', ''),
-                'latitude': forecast_data.get('city', {}).get('coord', {}).get('lat'),
-                'longitude': forecast_data.get('city', {}).get('coord', {}).get('lon'),
-                'timezone': forecast_data.get('city', {}).get('timezone'),
-                'sunrise': datetime.fromtimestamp(forecast_data.get('city', {}).get('sunrise', 0)).strftime('%H:%M:%S'),
-                'sunset': datetime.fromtimestamp(forecast_data.get('city', {}).get('sunset', 0)).strftime('%H:%M:%S')
+                'name': city.get('name', 'Unknown'),
+                'country': city.get('country', ''),
+                'latitude': coord.get('lat'),
+                'longitude': coord.get('lon'),
+                'timezone': city.get('timezone'),
+                'sunrise': format_time(city.get('sunrise', 0)),
+                'sunset': format_time(city.get('sunset', 0))
             }
             
             # Extract forecast list
@@ -164,26 +252,30 @@ class WeatherAPI:
             # Organize forecast data by date
             daily_forecasts = {}
             for item in forecast_list:
-                # Get date
-                dt = datetime.fromtimestamp(item.get('dt', 0))
-                date = dt.strftime('%Y-%m-%d')
-                time = dt.strftime('%H:%M:%S')
+                # Get date, the time of day is only formatted when displayed
+                timestamp = item.get('dt', 0)
+                date = datetime.fromtimestamp(timestamp).date().isoformat()
+                
+                # Look up each nested section once
+                main = item.get('main') or EMPTY
+                weather = (item.get('weather') or (EMPTY,))[0]
+                wind = item.get('wind') or EMPTY
                 
                 # Extract weather information
                 weather_info = {
-                    'time': time,
-                    'temperature': item.get('main', {}).get('temp'),
-                    'feels_like': item.get('main', {}).get('feels_like'),
-                    'temp_min': item.get('main', {}).get('temp_min'),
-                    'temp_max': item.get('main', {}).get('temp_max'),
-                    'pressure': item.get('main', {}).get('pressure'),
-                    'humidity': item.get('main', {}).get('humidity'),
-                    'weather_condition': item.get('weather', [{}])[0].get('main', 'Unknown'),
-                    'weather_description': item.get('weather', [{}])[0].get('description', 'Unknown'),
-                    'weather_icon': item.get('weather', [{}])[0].get('icon'),
-                    'clouds': item.get('clouds', {}).get('all'),
-                    'wind_speed': item.get('wind', {}).get('speed'),
-                    'wind_direction': self._get_wind_direction(item.get('wind', {}).get('deg')),
+                    'timestamp': timestamp,
+                    'temperature': main.get('temp'),
+                    'feels_like': main.get('feels_like'),
+                    'temp_min': main.get('temp_min'),
+                    'temp_max': main.get('temp_max'),
+                    'pressure': main.get('pressure'),
+                    'humidity': main.get('humidity'),
+                    'weather_condition': weather.get('main', 'Unknown'),
+                    'weather_description': weather.get('description', 'Unknown'),
+                    'weather_icon': weather.get('icon'),
+                    'clouds': (item.get('clouds') or EMPTY).get('all'),
+                    'wind_speed': wind.get('speed'),
+                    'wind_direction': self._get_wind_direction(wind.get('deg')),
                     'visibility': item.get('visibility'),
                     'pop': item.get('pop')  # Probability of precipitation
                 }
@@ -201,7 +293,7 @@ class WeatherAPI:
             
             return result
         except Exception as e:
-            print(f"Error parsing forecast data: {e}")
+            logger.warning("Error parsing forecast data: %s", e)
             return None
     
     def _get_wind_direction(self, degrees):
@@ -216,6 +308,4 @@ class WeatherAPI:
         if degrees is None:
             return "Unknown"
             
-        directions = ["North", "Northeast", "East", "Southeast", "South", "Southwest", "West", "Northwest"]
-        index = round(degrees / 45) % 8
-        return directions[index]
+        return _WIND_DIRECTIONS_BY_DEGREE[round(degrees) % 360]
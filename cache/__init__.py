@@ -0,0 +1,27 @@
+"""
+Response cache package
+"""
+import logging
+import os
+
+from cache.memory_cache import MemoryCache
+from cache.redis_cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+def create_cache(maxsize=512):
+    """Create the response cache for the API interfaces
+
+    Uses Redis when REDIS_URL is set, so every worker process shares one
+    cache; otherwise falls back to an in-process MemoryCache.
+
+    Args:
+        maxsize: Maximum number of entries for the in-process cache
+    """
+    redis_url = os.environ.get('REDIS_URL')
+    if redis_url:
+        try:
+            return RedisCache.from_url(redis_url)
+        except ImportError as e:
+            logger.warning("%s, using in-process cache", e)
+    return MemoryCache(maxsize=maxsize)
@@ -0,0 +1,62 @@
+"""
+In-Process Response Cache
+Keeps API responses in memory with a per-entry time to live
+"""
+import threading
+import time
+from collections import OrderedDict
+
+class MemoryCache:
+    """In-process cache with per-entry expiry
+
+    Expired entries are not dropped on read, so callers can still fall back
+    to the last known value when the upstream API is unavailable. Entries
+    are only evicted once the cache grows beyond maxsize, least recently
+    used first.
+    """
+
+    def __init__(self, maxsize=512):
+        """Initialize memory cache
+
+        Args:
+            maxsize: Maximum number of entries kept
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, allow_stale=False):
+        """Get a cached value
+
+        Args:
+            key: Cache key
+            allow_stale: Return the value even if it has expired
+
+        Returns:
+            Cached value, returns None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            # Keep recently read entries away from eviction
+            self._entries.move_to_end(key)
+
+        expires_at, value = entry
+        if not allow_stale and expires_at <= time.monotonic():
+            return None
+        return value
+
+    def set(self, key, value, ttl):
+        """Store a value
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
@@ -0,0 +1,82 @@
+"""
+Redis Response Cache
+Shares cached API responses between processes through Redis
+"""
+import logging
+import time
+
+try:
+    import redis
+except ImportError:  # redis is optional, MemoryCache is used without it
+    redis = None
+
+from json_codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Entries stay in Redis this long after they expire, so they can still
+# serve as a fallback while the upstream API is unavailable
+STALE_RETENTION = 24 * 60 * 60
+
+class RedisCache:
+    """Redis-backed cache with the same interface as MemoryCache
+
+    Each entry is a hash holding the JSON encoded value and its expiry time.
+    """
+
+    def __init__(self, client, prefix="weatherapp:"):
+        """Initialize Redis cache
+
+        Args:
+            client: redis.Redis client
+            prefix: Prefix added to every key
+        """
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        """Create a cache from a Redis URL (e.g. redis://localhost:6379/0)"""
+        if redis is None:
+            raise ImportError("redis is required for RedisCache, please run: pip install redis")
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key, allow_stale=False):
+        """Get a cached value
+
+        Args:
+            key: Cache key
+            allow_stale: Return the value even if it has expired
+
+        Returns:
+            Cached value, returns None if missing, expired or Redis is unreachable
+        """
+        try:
+            body, expires_at = self.client.hmget(self.prefix + key, 'body', 'expires_at')
+        except Exception as e:
+            logger.warning("Redis cache error: %s", e)
+            return None
+
+        if body is None:
+            return None
+        if not allow_stale and float(expires_at) <= time.time():
+            return None
+        return loads(body)
+
+    def set(self, key, value, ttl):
+        """Store a value
+
+        Args:
+            key: Cache key
+            value: JSON serializable value
+            ttl: Time to live in seconds
+        """
+        body = dumps(value)
+        full_key = self.prefix + key
+        try:
+            pipe = self.client.pipeline()
+            pipe.hset(full_key, mapping={'body': body, 'expires_at': time.time() + ttl})
+            pipe.expire(full_key, int(ttl) + STALE_RETENTION)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("Redis cache error: %s", e)
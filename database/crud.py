@@ -1,472 +1,478 @@
 """
 CRUD Operations Implementation
 """
+import logging
 import sqlite3
-from datetime import datetime
 from .schema import DatabaseManager
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of locations remembered by get_location_by_name
+LOCATION_CACHE_SIZE = 512
+
+# All SQL is kept in module constants so every call passes the same
+# statement text and hits the connection's prepared statement cache
+
+_UPSERT_LOCATION = """
+INSERT INTO locations (name, latitude, longitude) VALUES (?, ?, ?)
+ON CONFLICT(name) DO UPDATE SET name = excluded.name
+RETURNING id
+"""
+
+# Insert an observed record, or update the existing record for this location
+# and date; an observation also replaces a forecast for that date
+_UPSERT_WEATHER = """
+INSERT INTO weather_records 
+(location_id, date, temperature, feels_like, humidity, 
+wind_speed, wind_direction, weather_condition, weather_description)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(location_id, date) DO UPDATE SET 
+temperature = excluded.temperature, feels_like = excluded.feels_like, 
+humidity = excluded.humidity, wind_speed = excluded.wind_speed, 
+wind_direction = excluded.wind_direction, weather_condition = excluded.weather_condition, 
+weather_description = excluded.weather_description, is_forecast = 0, updated_at = CURRENT_TIMESTAMP
+"""
+
+_UPSERT_WEATHER_RETURNING_ID = _UPSERT_WEATHER + "RETURNING id"
+
+# Insert a forecast record; a newer forecast replaces an older one for the
+# same date, but never an observed record
+_UPSERT_FORECAST = """
+INSERT INTO weather_records 
+(location_id, date, temperature, feels_like, humidity, 
+wind_speed, wind_direction, weather_condition, weather_description, is_forecast)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+ON CONFLICT(location_id, date) DO UPDATE SET 
+temperature = excluded.temperature, feels_like = excluded.feels_like, 
+humidity = excluded.humidity, wind_speed = excluded.wind_speed, 
+wind_direction = excluded.wind_direction, weather_condition = excluded.weather_condition, 
+weather_description = excluded.weather_description, updated_at = CURRENT_TIMESTAMP
+WHERE weather_records.is_forecast = 1
+"""
+
+_INSERT_QUERY_HISTORY = "INSERT INTO query_history (location_id, start_date, end_date) VALUES (?, ?, ?)"
+
+_SELECT_LOCATION_BY_ID = "SELECT * FROM locations WHERE id = ?"
+_SELECT_LOCATION_BY_NAME = "SELECT * FROM locations WHERE name = ?"
+_SELECT_ALL_LOCATIONS = "SELECT * FROM locations ORDER BY name"
+
+# Weather record columns plus the location name, shared by every weather read
+_WEATHER_SELECT = """
+SELECT w.id, w.location_id, w.date, w.temperature, w.feels_like, w.humidity, 
+w.wind_speed, w.wind_direction, w.weather_condition, w.weather_description, 
+w.is_forecast, w.created_at, w.updated_at, l.name AS location_name 
+FROM weather_records w
+JOIN locations l ON w.location_id = l.id
+"""
+_SELECT_WEATHER_BY_ID = _WEATHER_SELECT + "WHERE w.id = ?"
+_SELECT_WEATHER_BY_DATE = _WEATHER_SELECT + "WHERE w.location_id = ? AND w.date = ?"
+_SELECT_WEATHER_BY_DATE_RANGE = _WEATHER_SELECT + "WHERE w.location_id = ? AND w.date BETWEEN ? AND ? ORDER BY w.date"
+_SELECT_ALL_WEATHER = _WEATHER_SELECT + "ORDER BY w.date DESC"
+
+# The same records serialised to one JSON array inside SQLite, so a whole
+# date range crosses into Python as a single string
+_WEATHER_JSON_SELECT = """
+SELECT json_group_array(json_object(
+    'id', id, 'location_id', location_id, 'date', date, 'temperature', temperature, 
+    'feels_like', feels_like, 'humidity', humidity, 'wind_speed', wind_speed, 
+    'wind_direction', wind_direction, 'weather_condition', weather_condition, 
+    'weather_description', weather_description, 'is_forecast', is_forecast, 'created_at', created_at, 
+    'updated_at', updated_at, 'location_name', location_name
+))
+FROM (
+    SELECT w.*, l.name AS location_name 
+    FROM weather_records w
+    JOIN locations l ON w.location_id = l.id
+    WHERE w.location_id = ? AND w.date BETWEEN ? AND ?
+    ORDER BY w.date
+)
+"""
+
+_SELECT_QUERY_HISTORY = """
+SELECT q.*, l.name as location_name 
+FROM query_history q
+JOIN locations l ON q.location_id = l.id
+ORDER BY q.created_at DESC
+LIMIT ?
+"""
+
+# COALESCE keeps the current value of each field passed as None
+_UPDATE_LOCATION = """
+UPDATE locations SET 
+name = COALESCE(?, name), latitude = COALESCE(?, latitude), longitude = COALESCE(?, longitude)
+WHERE id = ?
+"""
+
+_UPDATE_WEATHER = """
+UPDATE weather_records SET 
+temperature = COALESCE(?, temperature), feels_like = COALESCE(?, feels_like), 
+humidity = COALESCE(?, humidity), wind_speed = COALESCE(?, wind_speed), 
+wind_direction = COALESCE(?, wind_direction), weather_condition = COALESCE(?, weather_condition), 
+weather_description = COALESCE(?, weather_description), date = COALESCE(?, date), 
+updated_at = CURRENT_TIMESTAMP
+WHERE id = ?
+"""
+
+_DELETE_LOCATION = "DELETE FROM locations WHERE id = ?"
+_DELETE_WEATHER = "DELETE FROM weather_records WHERE id = ?"
+_DELETE_QUERY_HISTORY = "DELETE FROM query_history WHERE id = ?"
+
 class WeatherCRUD:
-    def __init__(self):
-        """Initialize CRUD operations class"""
-        self.db_manager = DatabaseManager()
+    def __init__(self, db_manager=None):
+        """Initialize CRUD operations class
+        
+        Args:
+            db_manager: DatabaseManager to share, a new one is created if None
+        """
+        self.db_manager = db_manager or DatabaseManager()
+        # Location name -> row, cleared whenever a location is updated or deleted
+        self._location_cache = {}
     
     # CREATE operations
     def create_location(self, name, latitude=None, longitude=None):
-        """Create a new location record"""
+        """Create a new location record, returns the existing ID if the name already exists"""
         try:
-            self.db_manager.connect()
-            
-            # Check if location already exists
-            self.db_manager.cursor.execute(
-                "SELECT id FROM locations WHERE name = ?", 
-                (name,)
-            )
-            existing = self.db_manager.cursor.fetchone()
-            
-            if existing:
-                return existing['id']  # If location exists, return existing ID
-            
-            # Create new location
-            self.db_manager.cursor.execute(
-                "INSERT INTO locations (name, latitude, longitude) VALUES (?, ?, ?)",
-                (name, latitude, longitude)
-            )
-            self.db_manager.conn.commit()
-            location_id = self.db_manager.cursor.lastrowid
-            return location_id
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            with self.db_manager.transaction() as cursor:
+                # Insert, or hit the unique name index and return the existing row
+                cursor.execute(_UPSERT_LOCATION, (name, latitude, longitude))
+                location_id = cursor.fetchone()['id']
+                return location_id
+        except sqlite3.Error:
+            logger.exception("Database error")
             return None
-        finally:
-            self.db_manager.close()
     
     def create_weather_record(self, location_id, date, temperature, feels_like=None, 
                              humidity=None, wind_speed=None, wind_direction=None,
                              weather_condition=None, weather_description=None):
         """Create a new weather record"""
         try:
-            self.db_manager.connect()
-            
-            # Check date format
-            valid_date = self.db_manager.validate_date(date)
-            if not valid_date:
-                return False, "Invalid date format, please use YYYY-MM-DD format"
-            
-            # Check if location exists
-            self.db_manager.cursor.execute(
-                "SELECT id FROM locations WHERE id = ?", 
-                (location_id,)
-            )
-            if not self.db_manager.cursor.fetchone():
+            with self.db_manager.transaction() as cursor:
+                # Check date format
+                valid_date = self.db_manager.validate_date(date)
+                if not valid_date:
+                    return False, "Invalid date format, please use YYYY-MM-DD format"
+                
+                # Insert, or update the existing record for this location and date;
+                # the location_id foreign key rejects unknown locations
+                cursor.execute(_UPSERT_WEATHER_RETURNING_ID, (
+                    location_id, date, temperature, feels_like, humidity, 
+                    wind_speed, wind_direction, weather_condition, weather_description
+                ))
+                record_id = cursor.fetchone()['id']
+                return True, record_id
+        except sqlite3.IntegrityError as e:
+            if "FOREIGN KEY" in str(e):
                 return False, "Location ID does not exist"
-            
-            # Try to insert or update weather record
-            try:
-                self.db_manager.cursor.execute("""
-                INSERT INTO weather_records 
-                (location_id, date, temperature, feels_like, humidity, 
-                wind_speed, wind_direction, weather_condition, weather_description)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (location_id, date, temperature, feels_like, humidity, 
-                     wind_speed, wind_direction, weather_condition, weather_description))
-                self.db_manager.conn.commit()
-                return True, self.db_manager.cursor.lastrowid
-            except sqlite3.IntegrityError:
-                # If record exists (unique constraint violation), update it
-                self.db_manager.cursor.execute("""
-                UPDATE weather_records SET 
-                temperature = ?, feels_like = ?, humidity = ?, 
-                wind_speed = ?, wind_direction = ?, weather_condition = ?, 
-                weather_description = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE location_id = ? AND date = ?
-                """, (temperature, feels_like, humidity, wind_speed, wind_direction, 
-                     weather_condition, weather_description, location_id, date))
-                self.db_manager.conn.commit()
-                return True, "Record updated"
+            # Constraint violations are expected input errors, no traceback needed
+            logger.error("Database constraint error: %s", e)
+            return False, f"Database error: {e}"
         except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            logger.exception("Database error")
+            return False, f"Database error: {e}"
+    
+    def bulk_create_weather_records(self, location_id, rows, forecast=False):
+        """Create or update many weather records for one location in a single transaction
+        
+        Args:
+            location_id: Location ID
+            rows: Iterable of (date, temperature, feels_like, humidity, wind_speed,
+                  wind_direction, weather_condition, weather_description) tuples
+            forecast: Store the rows as forecasts, which replace older forecasts
+                  for the same dates but leave observed records untouched
+                  
+        Returns:
+            tuple: (success, number of rows written or error message)
+        """
+        params = []
+        for row in rows:
+            if not self.db_manager.validate_date(row[0]):
+                return False, f"Invalid date format: {row[0]}, please use YYYY-MM-DD format"
+            params.append((location_id, *row))
+        
+        if not params:
+            return True, 0
+        
+        try:
+            with self.db_manager.transaction() as cursor:
+                cursor.executemany(_UPSERT_FORECAST if forecast else _UPSERT_WEATHER, params)
+                return True, cursor.rowcount
+        except sqlite3.IntegrityError as e:
+            if "FOREIGN KEY" in str(e):
+                return False, "Location ID does not exist"
+            # Constraint violations are expected input errors, no traceback needed
+            logger.error("Database constraint error: %s", e)
+            return False, f"Database error: {e}"
+        except sqlite3.Error as e:
+            logger.exception("Database error")
             return False, f"Database error: {e}"
-        finally:
-            self.db_manager.close()
     
     def create_query_history(self, location_id, start_date, end_date):
         """Create query history record"""
         try:
-            self.db_manager.connect()
-            
-            # Validate date range
-            valid, result = self.db_manager.validate_date_range(start_date, end_date)
-            if not valid:
-                return False, result
-            
-            # Check if location exists
-            self.db_manager.cursor.execute(
-                "SELECT id FROM locations WHERE id = ?", 
-                (location_id,)
-            )
-            if not self.db_manager.cursor.fetchone():
+            with self.db_manager.transaction() as cursor:
+                # Validate date range
+                valid, result = self.db_manager.validate_date_range(start_date, end_date)
+                if not valid:
+                    return False, result
+                
+                # Create query history record
+                cursor.execute(_INSERT_QUERY_HISTORY, (location_id, start_date, end_date))
+                return True, cursor.lastrowid
+        except sqlite3.IntegrityError as e:
+            if "FOREIGN KEY" in str(e):
                 return False, "Location ID does not exist"
-            
-            # Create query history record
-            self.db_manager.cursor.execute(
-                "INSERT INTO query_history (location_id, start_date, end_date) VALUES (?, ?, ?)",
-                (location_id, start_date, end_date)
-            )
-            self.db_manager.conn.commit()
-            return True, self.db_manager.cursor.lastrowid
+            # Constraint violations are expected input errors, no traceback needed
+            logger.error("Database constraint error: %s", e)
+            return False, f"Database error: {e}"
         except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            logger.exception("Database error")
             return False, f"Database error: {e}"
-        finally:
-            self.db_manager.close()
     
     # READ operations
     def get_location_by_id(self, location_id):
         """Get location information by ID"""
         try:
-            self.db_manager.connect()
-            self.db_manager.cursor.execute(
-                "SELECT * FROM locations WHERE id = ?", 
-                (location_id,)
-            )
-            location = self.db_manager.cursor.fetchone()
-            return dict(location) if location else None
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            with self.db_manager.reader() as cursor:
+                cursor.execute(_SELECT_LOCATION_BY_ID, (location_id,))
+                location = cursor.fetchone()
+                return dict(location) if location else None
+        except sqlite3.Error:
+            logger.exception("Database error")
             return None
-        finally:
-            self.db_manager.close()
     
     def get_location_by_name(self, name):
-        """Get location information by name"""
+        """Get location information by name, cached after the first lookup"""
+        location = self._location_cache.get(name)
+        if location is not None:
+            return dict(location)
+        
         try:
-            self.db_manager.connect()
-            self.db_manager.cursor.execute(
-                "SELECT * FROM locations WHERE name = ?", 
-                (name,)
-            )
-            location = self.db_manager.cursor.fetchone()
-            return dict(location) if location else None
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            with self.db_manager.reader() as cursor:
+                cursor.execute(_SELECT_LOCATION_BY_NAME, (name,))
+                location = cursor.fetchone()
+            if not location:
+                return None
+            
+            if len(self._location_cache) >= LOCATION_CACHE_SIZE:
+                # Drop the oldest entry
+                self._location_cache.pop(next(iter(self._location_cache)), None)
+            self._location_cache[name] = location = dict(location)
+            return dict(location)
+        except sqlite3.Error:
+            logger.exception("Database error")
             return None
-        finally:
-            self.db_manager.close()
     
     def get_all_locations(self):
         """Get all location information"""
         try:
-            self.db_manager.connect()
-            self.db_manager.cursor.execute("SELECT * FROM locations ORDER BY name")
-            locations = self.db_manager.cursor.fetchall()
-            return [dict(location) for location in locations]
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            with self.db_manager.reader() as cursor:
+                cursor.execute(_SELECT_ALL_LOCATIONS)
+                return [dict(location) for location in cursor]
+        except sqlite3.Error:
+            logger.exception("Database error")
             return []
-        finally:
-            self.db_manager.close()
+    
+    def _select_weather(self, sql, params=()):
+        """Run one of the weather record queries
+        
+        Returns:
+            list: Weather records with their location name
+        """
+        with self.db_manager.reader() as cursor:
+            cursor.execute(sql, params)
+            return [dict(record) for record in cursor]
     
     def get_weather_by_id(self, record_id):
         """Get weather record by ID"""
         try:
-            self.db_manager.connect()
-            self.db_manager.cursor.execute("""
-            SELECT w.*, l.name as location_name 
-            FROM weather_records w
-            JOIN locations l ON w.location_id = l.id
-            WHERE w.id = ?
-            """, (record_id,))
-            record = self.db_manager.cursor.fetchone()
-            return dict(record) if record else None
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            records = self._select_weather(_SELECT_WEATHER_BY_ID, (record_id,))
+            return records[0] if records else None
+        except sqlite3.Error:
+            logger.exception("Database error")
             return None
-        finally:
-            self.db_manager.close()
     
     def get_weather_by_location_and_date(self, location_id, date):
         """Get weather record by location ID and date"""
+        # Check date format
+        if not self.db_manager.validate_date(date):
+            return None
+        
         try:
-            self.db_manager.connect()
-            
-            # Check date format
-            valid_date = self.db_manager.validate_date(date)
-            if not valid_date:
-                return None
-            
-            self.db_manager.cursor.execute("""
-            SELECT w.*, l.name as location_name 
-            FROM weather_records w
-            JOIN locations l ON w.location_id = l.id
-            WHERE w.location_id = ? AND w.date = ?
-            """, (location_id, date))
-            record = self.db_manager.cursor.fetchone()
-            return dict(record) if record else None
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            records = self._select_weather(_SELECT_WEATHER_BY_DATE, (location_id, date))
+            return records[0] if records else None
+        except sqlite3.Error:
+            logger.exception("Database error")
             return None
-        finally:
-            self.db_manager.close()
     
     def get_weather_by_date_range(self, location_id, start_date, end_date):
         """Get weather records by location ID and date range"""
+        # Validate date range
+        valid, result = self.db_manager.validate_date_range(start_date, end_date)
+        if not valid:
+            return []
+        
         try:
-            self.db_manager.connect()
-            
-            # Validate date range
-            valid, result = self.db_manager.validate_date_range(start_date, end_date)
-            if not valid:
-                return []
-            
-            self.db_manager.cursor.execute("""
-            SELECT w.*, l.name as location_name 
-            FROM weather_records w
-            JOIN locations l ON w.location_id = l.id
-            WHERE w.location_id = ? AND w.date BETWEEN ? AND ?
-            ORDER BY w.date
-            """, (location_id, start_date, end_date))
-            records = self.db_manager.cursor.fetchall()
-            return [dict(record) for record in records]
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            return self._select_weather(_SELECT_WEATHER_BY_DATE_RANGE, (location_id, start_date, end_date))
+        except sqlite3.Error:
+            logger.exception("Database error")
             return []
-        finally:
-            self.db_manager.close()
     
     def get_all_weather_records(self):
         """Get all weather records"""
         try:
-            self.db_manager.connect()
-            self.db_manager.cursor.execute("""
-            SELECT w.*, l.name as location_name 
-            FROM weather_records w
-            JOIN locations l ON w.location_id = l.id
-            ORDER BY w.date DESC
-            """)
-            records = self.db_manager.cursor.fetchall()
-            return [dict(record) for record in records]
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            return self._select_weather(_SELECT_ALL_WEATHER)
+        except sqlite3.Error:
+            logger.exception("Database error")
             return []
-        finally:
-            self.db_manager.close()
+    
+    def iter_all_weather_records(self):
+        """Iterate over all weather records without building the whole list
+        
+        Yields:
+            dict: Weather record with its location name
+        """
+        try:
+            yield from self.db_manager.fetch_iter(_SELECT_ALL_WEATHER)
+        except sqlite3.Error:
+            logger.exception("Database error")
+    
+    def iter_weather_by_date_range(self, location_id, start_date, end_date):
+        """Iterate over weather records in a date range without building the whole list
+        
+        Args:
+            location_id: Location ID
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            
+        Yields:
+            dict: Weather record with its location name
+        """
+        valid, result = self.db_manager.validate_date_range(start_date, end_date)
+        if not valid:
+            return
+        
+        try:
+            yield from self.db_manager.fetch_iter(_SELECT_WEATHER_BY_DATE_RANGE, (location_id, start_date, end_date))
+        except sqlite3.Error:
+            logger.exception("Database error")
+    
+    def export_weather_json(self, location_id, start_date, end_date):
+        """Get weather records in a date range as a JSON array built by SQLite
+        
+        Args:
+            location_id: Location ID
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            
+        Returns:
+            str: JSON array of weather records, returns None if failed
+        """
+        valid, result = self.db_manager.validate_date_range(start_date, end_date)
+        if not valid:
+            return None
+        
+        try:
+            with self.db_manager.reader() as cursor:
+                cursor.execute(_WEATHER_JSON_SELECT, (location_id, start_date, end_date))
+                return cursor.fetchone()[0]
+        except sqlite3.Error:
+            logger.exception("Database error")
+            return None
     
     def get_query_history(self, limit=10):
         """Get query history records"""
         try:
-            self.db_manager.connect()
-            self.db_manager.cursor.execute("""
-            SELECT q.*, l.name as location_name 
-            FROM query_history q
-            JOIN locations l ON q.location_id = l.id
-            ORDER BY q.created_at DESC
-            LIMIT ?
-            """, (limit,))
-            records = self.db_manager.cursor.fetchall()
-            return [dict(record) for record in records]
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            with self.db_manager.reader() as cursor:
+                cursor.execute(_SELECT_QUERY_HISTORY, (limit,))
+                return [dict(record) for record in cursor]
+        except sqlite3.Error:
+            logger.exception("Database error")
             return []
-        finally:
-            self.db_manager.close()
     
     # UPDATE operations
     def update_location(self, location_id, name=None, latitude=None, longitude=None):
         """Update location information"""
         try:
-            self.db_manager.connect()
-            
-            # Check if location exists
-            self.db_manager.cursor.execute(
-                "SELECT * FROM locations WHERE id = ?", 
-                (location_id,)
-            )
-            location = self.db_manager.cursor.fetchone()
-            if not location:
-                return False, "Location ID does not exist"
-            
-            # Prepare update data
-            update_data = {}
-            if name is not None:
-                update_data['name'] = name
-            if latitude is not None:
-                update_data['latitude'] = latitude
-            if longitude is not None:
-                update_data['longitude'] = longitude
-            
-            if not update_data:
+            if name is None and latitude is None and longitude is None:
                 return True, "No update data provided"
             
-            # Build update SQL
-            set_clause = ", ".join([f"{key} = ?" for key in update_data.keys()])
-            values = list(update_data.values())
-            values.append(location_id)
-            
-            self.db_manager.cursor.execute(
-                f"UPDATE locations SET {set_clause} WHERE id = ?",
-                values
-            )
-            self.db_manager.conn.commit()
+            with self.db_manager.transaction() as cursor:
+                cursor.execute(_UPDATE_LOCATION, (name, latitude, longitude, location_id))
+                if cursor.rowcount == 0:
+                    return False, "Location ID does not exist"
+            self._location_cache.clear()
             return True, "Location information updated"
+        except sqlite3.IntegrityError as e:
+            # e.g. renaming onto an existing name or moving onto an existing date
+            logger.error("Database constraint error: %s", e)
+            return False, f"Database error: {e}"
         except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            logger.exception("Database error")
             return False, f"Database error: {e}"
-        finally:
-            self.db_manager.close()
     
     def update_weather_record(self, record_id, temperature=None, feels_like=None, 
                          humidity=None, wind_speed=None, wind_direction=None, 
                          weather_condition=None, weather_description=None, date=None):
         """Update weather record"""
         try:
-            self.db_manager.connect()
-            
-            # Check if record exists
-            self.db_manager.cursor.execute(
-                "SELECT * FROM weather_records WHERE id = ?", 
-                (record_id,)
-            )
-            record = self.db_manager.cursor.fetchone()
-            if not record:
-                return False, "Record ID does not exist"
-            
-            # Build update statement
-            update_fields = []
-            params = []
-            
-            if temperature is not None:
-                update_fields.append("temperature = ?")
-                params.append(temperature)
-            
-            if feels_like is not None:
-                update_fields.append("feels_like = ?")
-                params.append(feels_like)
-            
-            if humidity is not None:
-                update_fields.append("humidity = ?")
-                params.append(humidity)
-            
-            if wind_speed is not None:
-                update_fields.append("wind_speed = ?")
-                params.append(wind_speed)
-            
-            if wind_direction is not None:
-                update_fields.append("wind_direction = ?")
-                params.append(wind_direction)
-            
-            if weather_condition is not None:
-                update_fields.append("weather_condition = ?")
-                params.append(weather_condition)
-            
-            if weather_description is not None:
-                update_fields.append("weather_description = ?")
-                params.append(weather_description)
+            with self.db_manager.transaction() as cursor:
+                if date is not None and not self.db_manager.validate_date(date):
+                    return False, "Invalid date format, please use YYYY-MM-DD format"
                 
-            if date is not None:
-                # Validate date format
-                valid, result = self.db_manager.validate_date(date)
-                if not valid:
-                    return False, result
-                update_fields.append("date = ?")
-                params.append(date)
-            
-            update_fields.append("updated_at = CURRENT_TIMESTAMP")
-            
-            if not update_fields:
-                return False, "No fields provided for update"
-            
-            # Execute update
-            query = f"UPDATE weather_records SET {', '.join(update_fields)} WHERE id = ?"
-            params.append(record_id)
-            
-            self.db_manager.cursor.execute(query, params)
-            self.db_manager.conn.commit()
-            
-            return True, "Weather record updated"
+                # One fixed statement for every combination of fields, see _UPDATE_WEATHER
+                cursor.execute(_UPDATE_WEATHER, (
+                    temperature, feels_like, humidity, wind_speed, wind_direction,
+                    weather_condition, weather_description, date, record_id
+                ))
+                if cursor.rowcount == 0:
+                    return False, "Record ID does not exist"
+                
+                return True, "Weather record updated"
+        except sqlite3.IntegrityError as e:
+            # e.g. renaming onto an existing name or moving onto an existing date
+            logger.error("Database constraint error: %s", e)
+            return False, f"Database error: {e}"
         except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            logger.exception("Database error")
             return False, f"Database error: {e}"
-        finally:
-            self.db_manager.close()
 
     # DELETE operations
     def delete_location(self, location_id):
         """Delete location information (cascade delete related weather records and query history)"""
         try:
-            self.db_manager.connect()
-            
-            # Check if location exists
-            self.db_manager.cursor.execute(
-                "SELECT * FROM locations WHERE id = ?", 
-                (location_id,)
-            )
-            location = self.db_manager.cursor.fetchone()
-            if not location:
-                return False, "Location ID does not exist"
-            
-            # Delete location (foreign key constraints will automatically delete related records)
-            self.db_manager.cursor.execute(
-                "DELETE FROM locations WHERE id = ?",
-                (location_id,)
-            )
-            self.db_manager.conn.commit()
+            with self.db_manager.transaction() as cursor:
+                # Delete location (foreign key constraints will automatically delete related records)
+                cursor.execute(_DELETE_LOCATION, (location_id,))
+                if cursor.rowcount == 0:
+                    return False, "Location ID does not exist"
+            self._location_cache.clear()
             return True, "Location and related records deleted"
         except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            logger.exception("Database error")
             return False, f"Database error: {e}"
-        finally:
-            self.db_manager.close()
     
     def delete_weather_record(self, record_id):
         """Delete weather record"""
         try:
-            self.db_manager.connect()
-            
-            # Check if record exists
-            self.db_manager.cursor.execute(
-                "SELECT * FROM weather_records WHERE id = ?", 
-                (record_id,)
-            )
-            record = self.db_manager.cursor.fetchone()
-            if not record:
-                return False, "Record ID does not exist"
-            
-            # Delete record
-            self.db_manager.cursor.execute(
-                "DELETE FROM weather_records WHERE id = ?",
-                (record_id,)
-            )
-            self.db_manager.conn.commit()
-            return True, "Weather record deleted"
+            with self.db_manager.transaction() as cursor:
+                # Delete record
+                cursor.execute(_DELETE_WEATHER, (record_id,))
+                if cursor.rowcount == 0:
+                    return False, "Record ID does not exist"
+                return True, "Weather record deleted"
         except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            logger.exception("Database error")
             return False, f"Database error: {e}"
-        finally:
-            self.db_manager.close()
     
     def delete_query_history(self, query_id):
         """Delete query history record"""
         try:
-            self.db_manager.connect()
-            
-            # Check if record exists
-            self.db_manager.cursor.execute(
-                "SELECT * FROM query_history WHERE id = ?", 
-                (query_id,)
-            )
-            record = self.db_manager.cursor.fetchone()
-            if not record:
-                return False, "Query history ID does not exist"
-            
-            # Delete record
-            self.db_manager.cursor.execute(
-                "DELETE FROM query_history WHERE id = ?",
-                (query_id,)
-            )
-            self.db_manager.conn.commit()
-            return True, "Query history deleted"
+            with self.db_manager.transaction() as cursor:
+                # Delete record
+                cursor.execute(_DELETE_QUERY_HISTORY, (query_id,))
+                if cursor.rowcount == 0:
+                    return False, "Query history ID does not exist"
+                return True, "Query history deleted"
         except sqlite3.Error as e:
-            print(f"Database error: {e}")
+            logger.exception("Database error")
             return False, f"Database error: {e}"
-        finally:
-            self.db_manager.close()
@@ -1,87 +1,305 @@
 """
 Database Schema Definition
 """
+import logging
 import sqlite3
 import os
 import datetime
+import re
+import queue
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Strict YYYY-MM-DD, fromisoformat alone also accepts forms like 20250423
+_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+@lru_cache(maxsize=1024)
+def _parse_date(date_str):
+    """Parse a YYYY-MM-DD string, cached since the same dates are checked repeatedly
+    
+    Returns:
+        datetime.date: Parsed date, returns None if invalid
+    """
+    if not _DATE_RE.fullmatch(date_str):
+        return None
+    try:
+        return datetime.date.fromisoformat(date_str)
+    except ValueError:
+        return None
+
+# Maximum number of read-only connections kept next to the writer
+READER_POOL_SIZE = 4
 
 class DatabaseManager:
     def __init__(self, db_file='weather.db'):
         """Initialize database manager"""
-        self.db_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), db_file)
+        if db_file == ':memory:':
+            self.db_file = db_file
+        else:
+            self.db_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), db_file)
         self.conn = None
-        self.cursor = None
+        self._write_lock = threading.RLock()
+        self._transaction_owner = None  # ident of the thread inside transaction()
+        self._readers = queue.Queue()
+        self._reader_count = 0
+        self._pool_lock = threading.Lock()
         
     def connect(self):
-        """Connect to database"""
-        self.conn = sqlite3.connect(self.db_file)
-        self.conn.row_factory = sqlite3.Row  # Enable column name access for query results
-        self.cursor = self.conn.cursor()
+        """Connect to database
+        
+        The connection is opened once and reused by every later call, so
+        CRUD operations do not pay for reopening the database file. It is
+        the only connection that writes.
+        """
+        if self.conn is None:
+            self.conn = self._open()
         return self.conn
     
+    def _open(self, query_only=False):
+        """Open and configure a new connection"""
+        # isolation_level=None leaves transactions to explicit BEGIN/COMMIT, see transaction()
+        conn = sqlite3.connect(self.db_file, check_same_thread=False, isolation_level=None,
+                               cached_statements=256)
+        conn.row_factory = sqlite3.Row  # Enable column name access for query results
+        self._configure(conn)
+        if query_only:
+            conn.execute("PRAGMA query_only=TRUE")
+        return conn
+    
+    def _configure(self, conn):
+        """Apply connection settings
+        
+        WAL lets readers continue while a write is in progress and, with
+        synchronous=NORMAL, avoids a full fsync on every commit.
+        """
+        if self.db_file != ':memory:':
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")  # 20 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA foreign_keys=ON")  # Required for ON DELETE CASCADE
+    
+    @contextmanager
+    def cursor(self):
+        """Get a cursor on the shared connection
+        
+        Statements run in autocommit mode unless inside transaction().
+        """
+        cursor = self.connect().cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+    
+    def fetch_iter(self, sql, params=(), batch_size=1000):
+        """Yield query results as dictionaries without loading them all at once
+        
+        Args:
+            sql: SELECT statement
+            params: Statement parameters
+            batch_size: Number of rows fetched from SQLite per batch
+            
+        Yields:
+            dict: One result row
+        """
+        with self.reader() as cursor:
+            cursor.arraysize = batch_size
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+    
+    @contextmanager
+    def writer(self):
+        """Get a cursor on the writer connection, one writer at a time"""
+        with self._write_lock:
+            with self.cursor() as cursor:
+                yield cursor
+    
+    @contextmanager
+    def transaction(self):
+        """Run a block of writes as one transaction
+        
+        Begins with BEGIN IMMEDIATE so the write lock is taken up front,
+        commits when the block finishes and rolls back if it raises, so a
+        sequence of CRUD calls shares a single commit. Nested calls join
+        the outer transaction, and reads made by the same thread inside the
+        block go through the writer so they see its uncommitted writes.
+        
+        Yields:
+            sqlite3.Cursor: Cursor on the writer connection
+        """
+        with self.writer() as cursor:
+            conn = self.conn
+            if conn.in_transaction:
+                yield cursor
+                return
+            
+            cursor.execute("BEGIN IMMEDIATE")
+            self._transaction_owner = threading.get_ident()
+            try:
+                yield cursor
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                self._transaction_owner = None
+    
+    @contextmanager
+    def reader(self):
+        """Get a cursor on a pooled read-only connection
+        
+        With WAL, readers see the last committed data and are not blocked
+        by a write in progress on the writer connection. An in-memory
+        database exists only inside its own connection, and a thread inside
+        transaction() must see its own uncommitted writes, so those reads
+        go through the writer.
+        """
+        if self.db_file == ':memory:' or self._transaction_owner == threading.get_ident():
+            with self.writer() as cursor:
+                yield cursor
+            return
+        
+        conn = self._acquire_reader()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+            self._readers.put(conn)
+    
+    def _acquire_reader(self):
+        """Take a reader from the pool, opening one while below the pool size"""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._pool_lock:
+            if self._reader_count < READER_POOL_SIZE:
+                self._reader_count += 1
+                return self._open(query_only=True)
+        return self._readers.get()
+    
     def close(self):
-        """Close database connection"""
+        """Close database connections"""
         if self.conn:
             self.conn.close()
             self.conn = None
-            self.cursor = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+            self._reader_count -= 1
     
     def create_tables(self):
         """Create database tables"""
-        self.connect()
-        
-        # Create locations table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS locations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            latitude REAL,
-            longitude REAL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
+        with self.transaction() as cursor:
+            # Create locations table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS locations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                latitude REAL,
+                longitude REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            
+            # Create weather records table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS weather_records (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                location_id INTEGER NOT NULL,
+                date DATE NOT NULL,
+                temperature REAL,
+                feels_like REAL,
+                humidity INTEGER,
+                wind_speed REAL,
+                wind_direction TEXT,
+                weather_condition TEXT,
+                weather_description TEXT,
+                is_forecast INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (location_id) REFERENCES locations (id) ON DELETE CASCADE,
+                UNIQUE(location_id, date)
+            )
+            ''')
+            
+            # Create query history table
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS query_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                location_id INTEGER NOT NULL,
+                start_date DATE NOT NULL,
+                end_date DATE NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (location_id) REFERENCES locations (id) ON DELETE CASCADE
+            )
+            ''')
+            
+            # Databases from before forecast summaries were marked
+            cursor.execute("SELECT 1 FROM pragma_table_info('weather_records') WHERE name = 'is_forecast'")
+            if not cursor.fetchone():
+                cursor.execute("ALTER TABLE weather_records ADD COLUMN is_forecast INTEGER NOT NULL DEFAULT 0")
+            
+            # Everything below only runs the first time, on a new database or
+            # one created before the indexes existed
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_locations_name'")
+            if cursor.fetchone():
+                return
+            
+            # Older databases could hold the same location name more than once
+            self._merge_duplicate_locations(cursor)
+            
+            # Indexes for name lookups and the newest-first query history listing.
+            # weather_records lookups by (location_id, date) already use the index
+            # behind its UNIQUE constraint. Location names are kept unique by
+            # create_location, so the name index enforces it as well.
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_locations_name ON locations(name)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_query_history_created ON query_history(created_at DESC)")
+            
+            # Gather planner statistics once so the new indexes are picked up
+            cursor.execute("ANALYZE")
+    
+    def _merge_duplicate_locations(self, cursor):
+        """Merge locations sharing a name into the oldest one
         
-        # Create weather records table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS weather_records (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            location_id INTEGER NOT NULL,
-            date DATE NOT NULL,
-            temperature REAL,
-            feels_like REAL,
-            humidity INTEGER,
-            wind_speed REAL,
-            wind_direction TEXT,
-            weather_condition TEXT,
-            weather_description TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (location_id) REFERENCES locations (id) ON DELETE CASCADE,
-            UNIQUE(location_id, date)
-        )
-        ''')
+        Weather records and query history move to the kept location; where
+        both already have a record for the same date, the kept one wins.
         
-        # Create query history table
-        self.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS query_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            location_id INTEGER NOT NULL,
-            start_date DATE NOT NULL,
-            end_date DATE NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (location_id) REFERENCES locations (id) ON DELETE CASCADE
-        )
+        Args:
+            cursor: Cursor inside the create_tables() transaction
+        """
+        cursor.execute('''
+        SELECT l.id, k.keep_id FROM locations l
+        JOIN (SELECT name, MIN(id) AS keep_id FROM locations GROUP BY name HAVING COUNT(*) > 1) k
+          ON l.name = k.name AND l.id != k.keep_id
         ''')
-        
-        self.conn.commit()
-        self.close()
+        duplicates = cursor.fetchall()
+        for duplicate_id, keep_id in duplicates:
+            cursor.execute("UPDATE OR IGNORE weather_records SET location_id = ? WHERE location_id = ?",
+                           (keep_id, duplicate_id))
+            cursor.execute("UPDATE query_history SET location_id = ? WHERE location_id = ?",
+                           (keep_id, duplicate_id))
+            # Cascades to the weather records that clashed with the kept location
+            cursor.execute("DELETE FROM locations WHERE id = ?", (duplicate_id,))
+        if duplicates:
+            logger.warning("Merged %d duplicate location rows before adding the unique name index", len(duplicates))
     
     def validate_date(self, date_str):
         """Validate date format"""
-        try:
-            return datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
-        except ValueError:
-            return None
+        return _parse_date(date_str)
     
     def validate_date_range(self, start_date, end_date):
         """Validate if the date range is valid"""
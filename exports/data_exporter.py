@@ -4,10 +4,15 @@ Supports exporting weather data in multiple formats
 """
 import json
 import csv
-import xml.dom.minidom as md
+import io
 import xml.etree.ElementTree as ET
-import os
+from collections.abc import Iterator
 from datetime import datetime
+from functools import partial
+from itertools import chain
+
+# Marks an exhausted iterator when peeking at the first record
+_END = object()
 
 class DataExporter:
     """Data export class, supports multiple format data exports"""
@@ -17,58 +22,75 @@ class DataExporter:
         """Export data to JSON format
         
         Args:
-            data: Data to be exported
+            data: Data to be exported, an iterator of records is written one at a time
             file_path: Export file path, returns string if None
             
         Returns:
             str: Returns JSON string if file_path is None; otherwise returns None
         """
-        json_data = json.dumps(data, ensure_ascii=False, indent=4)
-        
         if file_path:
+            # Encode straight into the file rather than building the whole string first
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(json_data)
+                if isinstance(data, Iterator):
+                    DataExporter._write_json_array(data, f)
+                else:
+                    json.dump(data, f, ensure_ascii=False, indent=4)
             return None
         else:
-            return json_data
+            if isinstance(data, Iterator):
+                data = list(data)
+            return json.dumps(data, ensure_ascii=False, indent=4)
+    
+    @staticmethod
+    def _write_json_array(items, f):
+        """Write items as a JSON array, formatted like json.dump with indent=4"""
+        f.write("[")
+        separator = "\n    "
+        for item in items:
+            f.write(separator)
+            # Encoded strings never contain raw newlines, so this only indents the layout
+            f.write(json.dumps(item, ensure_ascii=False, indent=4).replace("\n", "\n    "))
+            separator = ",\n    "
+        f.write("]" if separator == "\n    " else "\n]")
     
     @staticmethod
     def export_to_csv(data, file_path=None, headers=None):
         """Export data to CSV format
         
         Args:
-            data: Data to be exported (list of dictionaries)
+            data: Data to be exported (list or iterator of dictionaries)
             file_path: Export file path, returns string if None
             headers: Column headers, if None uses data keys
             
         Returns:
             str: Returns CSV string if file_path is None; otherwise returns None
         """
-        if not data:
+        items = iter(data)
+        first = next(items, _END)
+        if first is _END:
             return "" if file_path is None else None
             
-        if headers is None and isinstance(data[0], dict):
-            headers = list(data[0].keys())
-        
-        csv_data = []
-        if headers:
-            csv_data.append(','.join(headers))
+        if headers is None and isinstance(first, dict):
+            headers = list(first.keys())
         
-        for item in data:
-            if isinstance(item, dict):
-                row = [str(item.get(h, '')) for h in headers]
-            else:
-                row = [str(i) for i in item]
-            csv_data.append(','.join(row))
+        rows = ([item.get(h, '') for h in headers] if isinstance(item, dict) else item
+                for item in chain((first,), items))
         
-        csv_string = '\n'.join(csv_data)
+        def write_csv(f):
+            # csv.writer quotes fields containing commas, quotes or newlines
+            writer = csv.writer(f, lineterminator='\n')
+            if headers:
+                writer.writerow(headers)
+            writer.writerows(rows)
         
         if file_path:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(csv_string)
+            with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                write_csv(f)
             return None
         else:
-            return csv_string
+            buffer = io.StringIO()
+            write_csv(buffer)
+            return buffer.getvalue()
     
     @staticmethod
     def export_to_xml(data, root_name='data', item_name='item', file_path=None):
@@ -83,25 +105,27 @@ class DataExporter:
         Returns:
             str: Returns XML string if file_path is None; otherwise returns None
         """
+        if isinstance(data, Iterator):
+            data = list(data)
+        
         root = ET.Element(root_name)
         
         if isinstance(data, list):
             for item in data:
-                item_elem = ET.SubElement(root, item_name)
+                # Scalar fields become attributes, one element per item instead of one per field
+                attrib = {}
                 if isinstance(item, dict):
-                    for key, value in item.items():
-                        if value is not None:
-                            child = ET.SubElement(item_elem, key)
-                            child.text = str(value)
+                    attrib = {key: str(value) for key, value in item.items() if value is not None}
+                ET.SubElement(root, item_name, attrib)
         elif isinstance(data, dict):
             for key, value in data.items():
                 if value is not None:
                     child = ET.SubElement(root, key)
                     child.text = str(value)
         
-        xml_string = ET.tostring(root, encoding='utf-8').decode('utf-8')
-        dom = md.parseString(xml_string)
-        pretty_xml = dom.toprettyxml(indent="  ")
+        # Indent the tree in place instead of re-parsing the output with minidom
+        ET.indent(root, space="  ")
+        pretty_xml = ET.tostring(root, encoding='unicode', xml_declaration=True) + "\n"
         
         if file_path:
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -122,29 +146,29 @@ class DataExporter:
         Returns:
             str: Returns Markdown string if file_path is None; otherwise returns None
         """
+        if isinstance(data, Iterator):
+            data = list(data)
+        
         md_lines = [f"# {title}", "", f"Generated Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ""]
         
         if isinstance(data, list):
             # If list data, create table
             if data and isinstance(data[0], dict):
                 headers = list(data[0].keys())
-                md_lines.append("| " + " | ".join(headers) + " |")
-                md_lines.append("| " + " | ".join(["---"] * len(headers)) + " |")
-                
-                for item in data:
-                    row = [str(item.get(h, '')) for h in headers]
-                    md_lines.append("| " + " | ".join(row) + " |")
+                row_format = "| " + " | ".join(["{}"] * len(headers)) + " |"
+                body = chain(
+                    (row_format.format(*headers), row_format.format(*["---"] * len(headers))),
+                    (row_format.format(*[item.get(h, '') for h in headers]) for item in data)
+                )
             else:
-                md_lines.append("## Data Items")
-                for i, item in enumerate(data):
-                    md_lines.append(f"{i+1}. {item}")
+                body = chain(("## Data Items",), (f"{i}. {item}" for i, item in enumerate(data, 1)))
         elif isinstance(data, dict):
             # If dictionary data, create list
-            md_lines.append("## Data Details")
-            for key, value in data.items():
-                md_lines.append(f"- **{key}**: {value}")
+            body = chain(("## Data Details",), (f"- **{key}**: {value}" for key, value in data.items()))
+        else:
+            body = ()
         
-        md_string = "\n".join(md_lines)
+        md_string = "\n".join(chain(md_lines, body))
         
         if file_path:
             with open(file_path, 'w', encoding='utf-8') as f:
@@ -165,13 +189,16 @@ class DataExporter:
         Returns:
             str: Returns formatted string if file_path is None; otherwise returns None
         """
-        if format_type.lower() == 'json':
-            return DataExporter.export_to_json(data, file_path)
-        elif format_type.lower() == 'csv':
-            return DataExporter.export_to_csv(data, file_path)
-        elif format_type.lower() == 'xml':
-            return DataExporter.export_to_xml(data, 'weather_data', 'record', file_path)
-        elif format_type.lower() == 'markdown' or format_type.lower() == 'md':
-            return DataExporter.export_to_markdown(data, "Weather Data Report", file_path)
-        else:
+        exporter = _EXPORTERS.get(format_type.lower())
+        if exporter is None:
             raise ValueError(f"Unsupported export format: {format_type}")
+        return exporter(data, file_path=file_path)
+
+# Export format name -> exporter, with the weather report names bound in
+_EXPORTERS = {
+    'json': DataExporter.export_to_json,
+    'csv': DataExporter.export_to_csv,
+    'xml': partial(DataExporter.export_to_xml, root_name='weather_data', item_name='record'),
+    'markdown': partial(DataExporter.export_to_markdown, title="Weather Data Report"),
+}
+_EXPORTERS['md'] = _EXPORTERS['markdown']
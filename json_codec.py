@@ -0,0 +1,40 @@
+"""
+JSON Codec Module
+One place deciding how API responses and cached values are encoded
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
+
+def loads(body):
+    """Decode a JSON document from raw bytes
+
+    Uses orjson when it is installed, which parses noticeably faster than
+    the stdlib json module on larger payloads such as forecasts. Both read
+    UTF-8 bytes directly, skipping the separate text-decoding pass.
+
+    Args:
+        body: Raw JSON bytes
+
+    Returns:
+        Decoded JSON data
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+def dumps(value):
+    """Encode a value as JSON
+
+    Args:
+        value: JSON serializable value
+
+    Returns:
+        bytes or str: Encoded JSON, bytes when orjson is installed
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value)
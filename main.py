@@ -4,111 +4,229 @@ Provides command-line interface for user interaction
 """
 import os
 import sys
+import asyncio
+import atexit
 import argparse
+import logging
+import logging.handlers
+import queue
+from collections import Counter
+from functools import cached_property, lru_cache
 from datetime import datetime, timedelta
+from itertools import chain, islice
 
 from database.schema import DatabaseManager
 from database.crud import WeatherCRUD
-from api.weather_api import WeatherAPI
+from api.http_session import create_session
+from api.weather_api import WeatherAPI, format_time, is_place_name
 from api.news_api import NewsAPI
 from exports.data_exporter import DataExporter
+from json_codec import loads
 
-class WeatherApp:
-    def __init__(self):
-        """Initialize weather application"""
-        # Initialize 
-        self.db_manager = DatabaseManager()
-        self.db_manager.create_tables()
+# Optional weather record fields shown by query: (label, column, unit suffix)
+_WEATHER_FIELDS = (
+    ('Feels Like', 'feels_like', '°C'),
+    ('Humidity', 'humidity', '%'),
+    ('Wind Speed', 'wind_speed', ' m/s'),
+    ('Wind Direction', 'wind_direction', ''),
+    ('Weather', 'weather_condition', ''),
+    ('Weather Description', 'weather_description', ''),
+)
+
+# Retry policy shared by the requests session and the aiohttp client
+HTTP_RETRIES = 2
+HTTP_BACKOFF_FACTOR = 0.2
+
+# Accepted answers to yes/no prompts
+_YES = frozenset(('y', 'yes'))
+_NO = frozenset(('n', 'no'))
+
+# Command name -> (WeatherApp method, parsed argument names passed to it in order)
+_COMMANDS = {
+    'get': ('get_current_weather', ('location', 'news')),
+    'forecast': ('get_weather_forecast', ('location', 'days', 'news')),
+    'query': ('query_weather_history', ('location', 'start', 'end')),
+    'update': ('update_weather', ('id', 'temp', 'humidity', 'condition', 'date')),
+    'delete': ('delete_record', ('type', 'id')),
+    'list': ('list_records', ('type',)),
+    'export': ('export_data', ('format', 'location', 'output', 'refresh')),
+    'news': ('get_location_news', ('location', 'limit')),
+}
 
-        self.crud = WeatherCRUD()
+def setup_logging(level=logging.WARNING):
+    """Route log records through a queue to a background stderr writer
+    
+    Callers only enqueue records, so logging never blocks on the stream.
+    """
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    # urllib3 reports every retry attempt, the final failure is logged by the API modules
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+    
+    listener.start()
+    atexit.register(listener.stop)
 
-        self.weather_api = WeatherAPI()
-        self.news_api = NewsAPI()
+def _async_clients():
+    """Import the aiohttp-based clients on first use
+    
+    Importing aiohttp takes a noticeable part of startup, and only the
+    commands that fetch concurrently need it.
+    """
+    from api import async_clients
+    return async_clients
 
-        self.exporter = DataExporter()
+def _mean(values, digits=2):
+    """Average the non-None values, rounded, or None when there are none"""
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    return round(sum(values) / len(values), digits)
+
+def _forecast_tag(record):
+    """Label shown after the date of a forecast summary record"""
+    return " (forecast)" if record['is_forecast'] else ""
+
+def _most_common(values):
+    """Most frequent value, ties go to the one seen first"""
+    return Counter(values).most_common(1)[0][0]
+
+@lru_cache(maxsize=None)
+def _build_parser():
+    """Build the command-line parser once"""
+    parser = argparse.ArgumentParser(description='Weather Application')
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+    
+    # Get current weather command
+    get_parser = subparsers.add_parser('get', help='Get current weather')
+    get_parser.add_argument('location', help='Location name, coordinates, or postal code')
+    get_parser.add_argument('--news', action='store_true', help='Also show location-related news')
+    
+    # Get weather forecast command
+    forecast_parser = subparsers.add_parser('forecast', help='Get weather forecast')
+    forecast_parser.add_argument('location', help='Location name, coordinates, or postal code')
+    forecast_parser.add_argument('--days', type=int, default=5, help='Number of forecast days (max 5)')
+    forecast_parser.add_argument('--news', action='store_true', help='Also show location-related news')
+    
+    # Query historical weather command
+    query_parser = subparsers.add_parser('query', help='Query historical weather')
+    query_parser.add_argument('location', help='Location name')
+    query_parser.add_argument('--start', help='Start date (YYYY-MM-DD), defaults to 7 days ago')
+    query_parser.add_argument('--end', help='End date (YYYY-MM-DD), defaults to today')
+    
+    # Update record command
+    update_parser = subparsers.add_parser('update', help='Update weather record')
+    update_parser.add_argument('id', type=int, help='Record ID')
+    update_parser.add_argument('--temp', type=float, help='Temperature')
+    update_parser.add_argument('--humidity', type=int, help='Humidity')
+    update_parser.add_argument('--condition', help='Weather condition')
+    update_parser.add_argument('--date', help='Date (YYYY-MM-DD)')
+    
+    # Delete record command
+    delete_parser = subparsers.add_parser('delete', help='Delete record')
+    delete_parser.add_argument('type', choices=['location', 'weather', 'query'], help='Record type')
+    delete_parser.add_argument('id', type=int, help='Record ID')
+    
+    # List records command
+    list_parser = subparsers.add_parser('list', help='List records')
+    list_parser.add_argument('type', choices=['locations', 'weather', 'queries'], help='Record type')
+    
+    # Export data command
+    export_parser = subparsers.add_parser('export', help='Export data')
+    export_parser.add_argument('format', choices=['json', 'csv', 'xml', 'markdown'], help='Export format')
+    export_parser.add_argument('--location', help='Location name (optional)')
+    export_parser.add_argument('--output', help='Output file path')
+    export_parser.add_argument('--refresh', action='store_true', help='Fetch current weather for the exported locations first')
+    
+    # Get news command
+    news_parser = subparsers.add_parser('news', help='Get location-related news')
+    news_parser.add_argument('location', help='Location name')
+    news_parser.add_argument('--limit', type=int, default=5, help='Number of news items')
+    
+    return parser
+
+class WeatherApp:
+    # Set once the tables have been created in this process
+    _schema_ready = False
+    
+    # Subsystems are created on first use, so a command only sets up what it needs
+    @cached_property
+    def db_manager(self):
+        """Database manager, with the schema created on first use"""
+        db_manager = DatabaseManager()
+        self._ensure_schema(db_manager)
+        return db_manager
+    
+    @cached_property
+    def crud(self):
+        """CRUD operations on the shared database manager"""
+        return WeatherCRUD(self.db_manager)
+    
+    @cached_property
+    def http_session(self):
+        """One keep-alive connection pool shared by both APIs"""
+        return create_session(pool_connections=10, pool_maxsize=25, retries=HTTP_RETRIES,
+                              backoff_factor=HTTP_BACKOFF_FACTOR)
+    
+    @cached_property
+    def weather_api(self):
+        """Weather API client"""
+        return WeatherAPI(session=self.http_session)
+    
+    @cached_property
+    def news_api(self):
+        """News API client"""
+        return NewsAPI(session=self.http_session)
+    
+    @cached_property
+    def exporter(self):
+        """Data exporter"""
+        return DataExporter()
+    
+    def _ensure_schema(self, db_manager):
+        """Create the database tables unless this process already has"""
+        if not WeatherApp._schema_ready:
+            db_manager.create_tables()
+            WeatherApp._schema_ready = True
     
     def run(self):
         """Run the application"""
-        parser = argparse.ArgumentParser(description='Weather Application')
-        subparsers = parser.add_subparsers(dest='command', help='Available commands')
-        
-        # Get current weather command
-        get_parser = subparsers.add_parser('get', help='Get current weather')
-        get_parser.add_argument('location', help='Location name, coordinates, or postal code')
-        
-        # Get weather forecast command
-        forecast_parser = subparsers.add_parser('forecast', help='Get weather forecast')
-        forecast_parser.add_argument('location', help='Location name, coordinates, or postal code')
-        forecast_parser.add_argument('--days', type=int, default=5, help='Number of forecast days (max 5)')
-        
-        # Query historical weather command
-        query_parser = subparsers.add_parser('query', help='Query historical weather')
-        query_parser.add_argument('location', help='Location name')
-        query_parser.add_argument('--start', help='Start date (YYYY-MM-DD)', default=(datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d'))
-        query_parser.add_argument('--end', help='End date (YYYY-MM-DD)', default=datetime.now().strftime('%Y-%m-%d'))
-        
-        # Update record command
-        update_parser = subparsers.add_parser('update', help='Update weather record')
-        update_parser.add_argument('id', type=int, help='Record ID')
-        update_parser.add_argument('--temp', type=float, help='Temperature')
-        update_parser.add_argument('--humidity', type=int, help='Humidity')
-        update_parser.add_argument('--condition', help='Weather condition')
-        update_parser.add_argument('--date', help='Date (YYYY-MM-DD)')
-        
-        # Delete record command
-        delete_parser = subparsers.add_parser('delete', help='Delete record')
-        delete_parser.add_argument('type', choices=['location', 'weather', 'query'], help='Record type')
-        delete_parser.add_argument('id', type=int, help='Record ID')
-        
-        # List records command
-        list_parser = subparsers.add_parser('list', help='List records')
-        list_parser.add_argument('type', choices=['locations', 'weather', 'queries'], help='Record type')
-        
-        # Export data command
-        export_parser = subparsers.add_parser('export', help='Export data')
-        export_parser.add_argument('format', choices=['json', 'csv', 'xml', 'markdown'], help='Export format')
-        export_parser.add_argument('--location', help='Location name (optional)')
-        export_parser.add_argument('--output', help='Output file path')
-        
-        # Get news command
-        news_parser = subparsers.add_parser('news', help='Get location-related news')
-        news_parser.add_argument('location', help='Location name')
-        news_parser.add_argument('--limit', type=int, default=5, help='Number of news items')
-        
+        parser = _build_parser()
         args = parser.parse_args()
         
-        if args.command == 'get':
-            self.get_current_weather(args.location)
-        elif args.command == 'forecast':
-            self.get_weather_forecast(args.location, args.days)
-        elif args.command == 'query':
-            self.query_weather_history(args.location, args.start, args.end)
-        elif args.command == 'update':
-            self.update_weather(args.id, args.temp, args.humidity, args.condition)
-        elif args.command == 'delete':
-            self.delete_record(args.type, args.id)
-        elif args.command == 'list':
-            self.list_records(args.type)
-        elif args.command == 'export':
-            self.export_data(args.format, args.location, args.output)
-        elif args.command == 'news':
-            self.get_location_news(args.location, args.limit)
-        elif args.command == 'update':
-            self.update_weather(args.id, args.temp, args.humidity, args.condition, args.date)
-
-        else:
+        command = _COMMANDS.get(args.command)
+        if command is None:
             parser.print_help()
+            return
+        
+        if args.command == 'query':
+            # Default dates are filled in here so only query pays for them
+            args.start = args.start or (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+            args.end = args.end or datetime.now().strftime('%Y-%m-%d')
+        
+        method_name, fields = command
+        getattr(self, method_name)(*(getattr(args, field) for field in fields))
     
-    def get_current_weather(self, location):
+    def get_current_weather(self, location, with_news=False):
         """Get current weather
         
         Args:
             location: Location name, coordinates, or postal code
+            with_news: Show location news without asking
         """
         print(f"Getting current weather for {location}...")
         
-        # Get weather from API
-        weather_data = self.weather_api.get_current_weather(location)
+        # Get weather from API, together with the news when both are wanted
+        news = None
+        if with_news and is_place_name(location):
+            weather_data, news = self._fetch_weather_and_news('current', location)
+        else:
+            weather_data = self.weather_api.get_current_weather(location)
         if not weather_data:
             print("Failed to get weather data")
             return
@@ -120,6 +238,33 @@ class WeatherApp:
             return
         
         # Save to database
+        success = self._save_weather(parsed_data)
+        
+        if success:
+            print(f"Weather data saved for {parsed_data['location']}")
+        
+
+        print("\nCurrent Weather Information:")
+        print(f"Location: {parsed_data['location']}, {parsed_data['country']}")
+        print(f"Date Time: {parsed_data['date']} {parsed_data['time']}")
+        print(f"Temperature: {parsed_data['temperature']}°C (Feels like: {parsed_data['feels_like']}°C)")
+        print(f"Humidity: {parsed_data['humidity']}%")
+        print(f"Wind Speed: {parsed_data['wind_speed']} m/s ({parsed_data['wind_direction']})")
+        print(f"Weather: {parsed_data['weather_description']}")
+        print(f"Sunrise: {parsed_data['sunrise']}, Sunset: {parsed_data['sunset']}")
+        
+
+        self._show_news(parsed_data['location'], with_news, news, location)
+    
+    def _save_weather(self, parsed_data):
+        """Save parsed current weather and its location
+        
+        Args:
+            parsed_data: Weather data from parse_weather_data
+            
+        Returns:
+            bool: Whether the record was saved
+        """
         location_id = self.crud.create_location(
             parsed_data['location'], 
             parsed_data['latitude'], 
@@ -137,34 +282,24 @@ class WeatherApp:
             parsed_data['weather_condition'],
             parsed_data['weather_description']
         )
-        
-        if success:
-            print(f"Weather data saved for {parsed_data['location']}")
-        
-
-        print("\nCurrent Weather Information:")
-        print(f"Location: {parsed_data['location']}, {parsed_data['country']}")
-        print(f"Date Time: {parsed_data['date']} {parsed_data['time']}")
-        print(f"Temperature: {parsed_data['temperature']}°C (Feels like: {parsed_data['feels_like']}°C)")
-        print(f"Humidity: {parsed_data['humidity']}%")
-        print(f"Wind Speed: {parsed_data['wind_speed']} m/s ({parsed_data['wind_direction']})")
-        print(f"Weather: {parsed_data['weather_description']}")
-        print(f"Sunrise: {parsed_data['sunrise']}, Sunset: {parsed_data['sunset']}")
-        
-
-        self._ask_for_news(parsed_data['location'])
+        return success
     
-    def get_weather_forecast(self, location, days=5):
+    def get_weather_forecast(self, location, days=5, with_news=False):
         """Get weather forecast
         
         Args:
             location: Location name, coordinates, or postal code
             days: Number of forecast days (max 5)
+            with_news: Show location news without asking
         """
         print(f"Getting {days}-day weather forecast for {location}...")
         
-        # Get forecast data from API
-        forecast_data = self.weather_api.get_forecast(location, days)
+        # Get forecast data from API, together with the news when both are wanted
+        news = None
+        if with_news and is_place_name(location):
+            forecast_data, news = self._fetch_weather_and_news('forecast', location, days)
+        else:
+            forecast_data = self.weather_api.get_forecast(location, days)
         if not forecast_data:
             print("Failed to get weather forecast")
             return
@@ -175,21 +310,21 @@ class WeatherApp:
             print("Failed to parse forecast data")
             return
         
-        #  city information
+        #  city information (output is collected and written once at the end)
         city_info = parsed_data['city']
-        print(f"\nCity Information: {city_info['name']}, {city_info['country']}")
-        print(f"Coordinates: ({city_info['latitude']}, {city_info['longitude']})")
-        print(f"Sunrise: {city_info['sunrise']}, Sunset: {city_info['sunset']}")
+        out = [
+            f"\nCity Information: {city_info['name']}, {city_info['country']}",
+            f"Coordinates: ({city_info['latitude']}, {city_info['longitude']})",
+            f"Sunrise: {city_info['sunrise']}, Sunset: {city_info['sunset']}",
+        ]
         
         #  weather forecast
         daily_forecasts = parsed_data['daily_forecasts']
-        print(f"\nWeather forecast for next {min(days, len(daily_forecasts))} days:")
+        out.append(f"\nWeather forecast for next {min(days, len(daily_forecasts))} days:")
+        daily_rows = []
         
-        for date, forecasts in daily_forecasts.items():
-            if len(daily_forecasts) > days and list(daily_forecasts.keys()).index(date) >= days:
-                break
-                
-            print(f"\n=== {date} ===")
+        for date, forecasts in islice(daily_forecasts.items(), max(days, 0)):
+            out.append(f"\n=== {date} ===")
             
             # Calculate avg
             temps = [f['temperature'] for f in forecasts]
@@ -198,25 +333,56 @@ class WeatherApp:
             max_temp = max(temps)
             min_temp = min(temps)
             
-            conditions = {}
-            for f in forecasts:
-                condition = f['weather_condition']
-                if condition in conditions:
-                    conditions[condition] += 1
-                else:
-                    conditions[condition] = 1
+            main_condition = _most_common(f['weather_condition'] for f in forecasts)
             
-            main_condition = max(conditions.items(), key=lambda x: x[1])[0]
+            # Daily summary saved alongside the other weather records
+            daily_rows.append((
+                date,
+                round(avg_temp, 2),
+                _mean(f['feels_like'] for f in forecasts),
+                _mean((f['humidity'] for f in forecasts), digits=None),
+                _mean(f['wind_speed'] for f in forecasts),
+                _most_common(f['wind_direction'] for f in forecasts),
+                main_condition,
+                _most_common(f['weather_description'] for f in forecasts)
+            ))
             
-            print(f"Average Temperature: {avg_temp:.1f}°C (High: {max_temp:.1f}°C, Low: {min_temp:.1f}°C)")
-            print(f"Main Weather: {main_condition}")
+            out.append(f"Average Temperature: {avg_temp:.1f}°C (High: {max_temp:.1f}°C, Low: {min_temp:.1f}°C)")
+            out.append(f"Main Weather: {main_condition}")
             
             # Display 3-hourly forecast
-            print("\nHourly Forecast:")
+            out.append("\nHourly Forecast:")
             for forecast in forecasts:
-                print(f"  {forecast['time']}: {forecast['temperature']:.1f}°C, {forecast['weather_description']}, Precipitation Chance: {forecast['pop']*100:.0f}%")
+                out.append(f"  {format_time(forecast['timestamp'])}: {forecast['temperature']:.1f}°C, {forecast['weather_description']}, Precipitation Chance: {forecast['pop']*100:.0f}%")
         
-        self._ask_for_news(city_info['name'])
+        self._write_lines(out)
+        
+        self._save_forecast(city_info, daily_rows)
+        self._show_news(city_info['name'], with_news, news, location)
+    
+    def _save_forecast(self, city_info, daily_rows):
+        """Save daily forecast summaries without overwriting existing records
+        
+        Args:
+            city_info: City information from parse_forecast_data
+            daily_rows: Weather record tuples, one per forecast day
+        """
+        if not daily_rows:
+            return
+        
+        # Location and records share one commit
+        with self.db_manager.transaction():
+            location_id = self.crud.create_location(
+                city_info['name'],
+                city_info['latitude'],
+                city_info['longitude']
+            )
+            if location_id is None:
+                return
+            success, result = self.crud.bulk_create_weather_records(location_id, daily_rows, forecast=True)
+        
+        if success and result:
+            print(f"\nForecast summaries saved for {city_info['name']} ({result} days)")
     
     def query_weather_history(self, location, start_date, end_date):
         """Query historical weather
@@ -252,23 +418,13 @@ class WeatherApp:
             print("No weather records found")
             return
         
-        print(f"\nFound {len(records)} weather records:")
+        out = [f"\nFound {len(records)} weather records:"]
         for record in records:
-            print(f"\nDate: {record['date']}")
-            print(f"Location: {record['location_name']}")
-            print(f"Temperature: {record['temperature']}°C")
-            if record['feels_like']:
-                print(f"Feels Like: {record['feels_like']}°C")
-            if record['humidity']:
-                print(f"Humidity: {record['humidity']}%")
-            if record['wind_speed']:
-                print(f"Wind Speed: {record['wind_speed']} m/s")
-            if record['wind_direction']:
-                print(f"Wind Direction: {record['wind_direction']}")
-            if record['weather_condition']:
-                print(f"Weather: {record['weather_condition']}")
-            if record['weather_description']:
-                print(f"Weather Description: {record['weather_description']}")
+            out.append(f"\nDate: {record['date']}{_forecast_tag(record)}")
+            out.append(f"Location: {record['location_name']}")
+            out.append(f"Temperature: {record['temperature']}°C")
+            out.extend(f"{label}: {record[key]}{unit}" for label, key, unit in _WEATHER_FIELDS if record[key])
+        self._write_lines(out)
     
     def update_weather(self, record_id, temperature, humidity, condition, date=None):
         """
@@ -336,40 +492,48 @@ class WeatherApp:
         if record_type == 'locations':
             records = self.crud.get_all_locations()
             if records:
-                print(f"\nFound {len(records)} locations:")
+                out = [f"\nFound {len(records)} locations:"]
                 for record in records:
-                    print(f"ID: {record['id']}, Name: {record['name']}, Coordinates: ({record['latitude']}, {record['longitude']})")
+                    out.append(f"ID: {record['id']}, Name: {record['name']}, Coordinates: ({record['latitude']}, {record['longitude']})")
+                self._write_lines(out)
             else:
                 print("No location records found")
         
         elif record_type == 'weather':
             records = self.crud.get_all_weather_records()
             if records:
-                print(f"\nFound {len(records)} weather records:")
+                out = [f"\nFound {len(records)} weather records:"]
                 for record in records:
-                    print(f"ID: {record['id']}, Location: {record['location_name']}, Date: {record['date']}, Temperature: {record['temperature']}°C")
+                    out.append(f"ID: {record['id']}, Location: {record['location_name']}, Date: {record['date']}{_forecast_tag(record)}, Temperature: {record['temperature']}°C")
+                self._write_lines(out)
             else:
                 print("No weather records found")
         
         elif record_type == 'queries':
             records = self.crud.get_query_history()
             if records:
-                print(f"\nFound {len(records)} query history records:")
+                out = [f"\nFound {len(records)} query history records:"]
                 for record in records:
-                    print(f"ID: {record['id']}, Location: {record['location_name']}, Date Range: {record['start_date']} to {record['end_date']}")
+                    out.append(f"ID: {record['id']}, Location: {record['location_name']}, Date Range: {record['start_date']} to {record['end_date']}")
+                self._write_lines(out)
             else:
                 print("No query history found")
         
         else:
             print(f"Unsupported record type: {record_type}")
     
-    def export_data(self, format_type, location=None, output_path=None):
+    def export_data(self, format_type, location=None, output_path=None, refresh=False):
         """
         Export data
         format_type: Export format (json, csv, xml, markdown)
+        refresh: Fetch current weather for the exported locations first
         """
         print(f"Exporting data in {format_type} format...")
         
+        if refresh:
+            names = [location] if location else [l['name'] for l in self.crud.get_all_locations()]
+            self._refresh_weather(names)
+        
         # Get data to export
         if location:
             location_data = self.crud.get_location_by_name(location)
@@ -377,25 +541,32 @@ class WeatherApp:
                 print(f"Location '{location}' does not exist")
                 return
             
-            records = self.crud.get_weather_by_date_range(
+            date_range = (
                 location_data['id'],
                 (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d'),
                 datetime.now().strftime('%Y-%m-%d')
             )
+            if format_type == 'json':
+                # SQLite builds the whole array, the exporter only re-indents it
+                weather_json = self.crud.export_weather_json(*date_range)
+                records = iter(loads(weather_json) if weather_json else ())
+            else:
+                records = self.crud.iter_weather_by_date_range(*date_range)
         else:
-            records = self.crud.get_all_weather_records()
+            records = self.crud.iter_all_weather_records()
         
-        if not records:
+        # Records are streamed from the database, peek at the first one to spot an empty export
+        first = next(records, None)
+        if first is None:
             print("No data to export")
             return
+        records = chain((first,), records)
         
         # Set default output path
         if not output_path:
             timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-            filename = f"weather_data_{timestamp}.{format_type}"
-            if format_type == 'markdown':
-                filename = f"weather_data_{timestamp}.md"
-            output_path = os.path.join(os.getcwd(), filename)
+            extension = 'md' if format_type == 'markdown' else format_type
+            output_path = os.path.join(os.getcwd(), f"weather_data_{timestamp}.{extension}")
         
         # Export data
         try:
@@ -404,6 +575,33 @@ class WeatherApp:
         except Exception as e:
             print(f"Failed to export data: {e}")
     
+    def _refresh_weather(self, locations):
+        """Fetch and save current weather for several locations
+        
+        Args:
+            locations: List of location names
+        """
+        print(f"Refreshing current weather for {len(locations)} locations...")
+        
+        if _async_clients().ASYNC_AVAILABLE:
+            results = asyncio.run(self._get_current_weather_bulk(locations))
+        else:
+            results = {location: self.weather_api.get_current_weather(location) for location in locations}
+        
+        saved = 0
+        # One transaction, so the whole refresh is written with a single commit
+        with self.db_manager.transaction():
+            for weather_data in results.values():
+                parsed_data = self.weather_api.parse_weather_data(weather_data)
+                if parsed_data and self._save_weather(parsed_data):
+                    saved += 1
+        print(f"Updated weather for {saved} of {len(locations)} locations")
+    
+    async def _get_current_weather_bulk(self, locations):
+        """Request current weather for all locations concurrently on one aiohttp session"""
+        async with self._async_client() as client:
+            return await client.get_current_weather_bulk(locations)
+    
     def get_location_news(self, location, limit=5):
         """Get location-related news
         
@@ -415,7 +613,14 @@ class WeatherApp:
         
         # Get news
         news = self.news_api.get_location_news(location, limit)
+        self._print_news(news)
+    
+    def _print_news(self, news):
+        """Print news items
         
+        Args:
+            news: List of news items
+        """
         if not news:
             print("No related news found")
             return
@@ -427,20 +632,80 @@ class WeatherApp:
             print(f"   Source: {article['source']}, Published Date: {article['published_date']}")
             print(f"   URL: {article['url']}")
     
+    def _fetch_weather_and_news(self, kind, location, days=5, limit=5):
+        """Get weather and location news, concurrently when aiohttp is installed
+        
+        Args:
+            kind: 'current' or 'forecast'
+            location: Location name
+            days: Number of forecast days
+            limit: Number of news items
+            
+        Returns:
+            tuple: (raw weather data, list of news items)
+        """
+        if _async_clients().ASYNC_AVAILABLE:
+            return asyncio.run(self._fetch_weather_and_news_async(kind, location, days, limit))
+        
+        if kind == 'forecast':
+            weather_data = self.weather_api.get_forecast(location, days)
+        else:
+            weather_data = self.weather_api.get_current_weather(location)
+        return weather_data, self.news_api.get_location_news(location, limit)
+    
+    async def _fetch_weather_and_news_async(self, kind, location, days, limit):
+        """Run the weather and news requests side by side on one aiohttp session"""
+        async with self._async_client() as client:
+            if kind == 'forecast':
+                weather = client.get_forecast(location, days)
+            else:
+                weather = client.get_current_weather(location)
+            weather_data, news = await asyncio.gather(weather, client.get_location_news(location, limit))
+        return weather_data, news
+    
+    def _async_client(self):
+        """aiohttp client sharing the API clients, caches and retry policy of the sync requests"""
+        return _async_clients().AsyncAPIClient(self.weather_api, self.news_api, retries=HTTP_RETRIES,
+                                               backoff_factor=HTTP_BACKOFF_FACTOR)
+    
+    def _show_news(self, location, with_news, news=None, news_query=None):
+        """Show location news, asking first unless it was requested
+        
+        Args:
+            location: Location name reported by the weather API
+            with_news: News was requested on the command line
+            news: News already fetched alongside the weather, if any
+            news_query: Location text that news was searched with
+        """
+        if not with_news:
+            self._ask_for_news(location)
+            return
+        
+        print(f"\nGetting news related to {location}...")
+        # News searched with the typed input is only kept when it names the same place
+        if news is None or (news_query or '').strip().lower() != location.lower():
+            news = self.news_api.get_location_news(location)
+        self._print_news(news)
+    
+    def _write_lines(self, lines):
+        """Write output lines with a single stdout write instead of one print per line"""
+        sys.stdout.write("\n".join(lines) + "\n")
+    
     def _ask_for_news(self, location):
         """
         Ask user if they want to get local news
         """
         while True:
             response = input(f"\nWould you like to get news related to {location}? (y/n): ").strip().lower()
-            if response in ['y', 'yes']:
+            if response in _YES:
                 self.get_location_news(location)
                 break
-            elif response in ['n', 'no']:
+            elif response in _NO:
                 break
             else:
                 print("Please enter y or n")
 
 if __name__ == "__main__":
+    setup_logging()
     app = WeatherApp()
     app.run()
@@ -0,0 +1,198 @@
+"""
+This file is used to test the response cache and the conditional requests of the weather API.
+It won't be used externally.
+Thus, the language is Chinese for author's convenience.
+"""
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache.memory_cache import MemoryCache
+from api.weather_api import WeatherAPI
+from api.async_clients import AsyncAPIClient, ASYNC_AVAILABLE
+
+if ASYNC_AVAILABLE:
+    from aiohttp import web
+
+class FakeResponse:
+    """模拟的requests响应"""
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.text = body.decode()
+        self.headers = headers or {}
+
+class FakeSession:
+    """按顺序返回预设响应，并记录每次请求的请求头"""
+    def __init__(self, responses, on_get=None):
+        self.responses = list(responses)
+        self.sent_headers = []
+        self.on_get = on_get
+
+    def get(self, endpoint, params=None, headers=None, timeout=None):
+        self.sent_headers.append(headers)
+        if self.on_get:
+            self.on_get(headers)
+        return self.responses.pop(0)
+
+def expire(cache, key):
+    """让缓存条目立即过期，但保留其值"""
+    expires_at, value = cache._entries[key]
+    cache._entries[key] = (0, value)
+
+def run_with_server(responses, call):
+    """在本地启动aiohttp服务，按顺序返回预设响应，并运行call(base_url)
+
+    Returns:
+        tuple: (call的结果, 每次请求的If-None-Match请求头)
+    """
+    async def main():
+        seen = []
+
+        async def handler(request):
+            seen.append(request.headers.get('If-None-Match'))
+            status, body, headers = responses.pop(0)
+            return web.Response(status=status, body=body, headers=headers)
+
+        app = web.Application()
+        app.router.add_get('/{path}', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            return await call(f"http://127.0.0.1:{port}"), seen
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+def test_memory_cache():
+    """测试内存缓存的过期与allow_stale"""
+    print("\n---------------测试内存缓存---------------")
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", {"v": 1}, 60)
+    print(f"未过期读取结果: {cache.get('a')}")
+
+    cache.set("b", {"v": 2}, 0)
+    print(f"过期后读取结果: {cache.get('b')}")
+    print(f"过期后allow_stale读取结果: {cache.get('b', allow_stale=True)}")
+
+    cache.set("c", {"v": 3}, 60)
+    print(f"超出maxsize后最旧条目被淘汰: {cache.get('a', allow_stale=True) is None}")
+
+    # 读取b后再写入d，应淘汰最久未使用的c而不是b
+    cache.get("b", allow_stale=True)
+    cache.set("d", {"v": 4}, 60)
+    print(f"最近读取的条目被保留: {cache.get('b', allow_stale=True) is not None}, 最久未使用的条目被淘汰: {cache.get('c') is None}")
+
+def test_conditional_requests():
+    """测试ETag条件请求、304复用缓存与失败时回退到过期缓存"""
+    print("\n---------------测试条件请求---------------")
+    body = b'{"name": "Beijing"}'
+    cache = MemoryCache()
+    session = FakeSession([
+        FakeResponse(200, body, {'ETag': '"v1"', 'Last-Modified': 'Wed, 15 Oct 2025 00:00:00 GMT'}),
+        FakeResponse(304),
+        FakeResponse(500, b'error'),
+    ])
+    api = WeatherAPI(api_key="test", session=session, cache=cache)
+    key = api.cached_request('current', "Beijing", "metric").cache_key
+
+    # 测试首次请求保存ETag
+    data = api.get_current_weather("Beijing")
+    print(f"首次请求结果: {data}, 请求头 = {session.sent_headers[0]}")
+    print(f"保存的验证信息: {cache.get(key + ':validators')}")
+
+    # 测试缓存未过期时不发送请求
+    api.get_current_weather("Beijing")
+    print(f"缓存命中时请求次数: {len(session.sent_headers)}")
+
+    # 测试过期后发送条件请求，304时复用缓存并刷新TTL
+    expire(cache, key)
+    data = api.get_current_weather("Beijing")
+    print(f"304请求结果: {data}, 请求头 = {session.sent_headers[1]}")
+    print(f"304后缓存已刷新: {cache.get(key) is not None}")
+
+    # 测试请求失败时回退到过期缓存
+    expire(cache, key)
+    data = api.get_current_weather("Beijing")
+    print(f"500回退结果: {data}, 请求次数 = {len(session.sent_headers)}")
+
+def test_evicted_during_revalidation():
+    """测试条件请求发出后缓存条目被淘汰时，304仍使用请求开始时取出的缓存"""
+    print("\n---------------测试304前缓存被淘汰---------------")
+    cache = MemoryCache()
+    api = WeatherAPI(api_key="test", cache=cache)
+    key = api.cached_request('current', "Shanghai", "metric").cache_key
+    cache.set(key, {"name": "Shanghai"}, 0)
+    cache.set(key + ':validators', {'etag': '"v1"', 'last_modified': None}, 60)
+
+    def evict(headers):
+        # 条件请求发出后，缓存条目被淘汰
+        cache._entries.pop(key, None)
+
+    session = FakeSession([FakeResponse(304)], on_get=evict)
+    api.session = session
+
+    data = api.get_current_weather("Shanghai")
+    print(f"304结果: {data}, 请求头 = {session.sent_headers}")
+    print(f"缓存已重新写入: {cache.get(key) is not None}")
+
+def test_async_retry():
+    """测试异步客户端与requests会话一样重试临时错误"""
+    print("\n---------------测试异步客户端重试---------------")
+    if not ASYNC_AVAILABLE:
+        print("未安装aiohttp，跳过")
+        return
+    api = WeatherAPI(api_key="test", cache=MemoryCache())
+
+    async def call(base_url):
+        api.base_url = base_url
+        async with AsyncAPIClient(api, retries=2, backoff_factor=0) as client:
+            return await client.get_current_weather("Beijing")
+
+    data, seen = run_with_server([
+        (503, b'busy', {}),
+        (200, b'{"name": "Beijing"}', {}),
+    ], call)
+    print(f"503后重试结果: {data}, 请求次数 = {len(seen)}")
+
+def test_async_conditional_requests():
+    """测试异步客户端同样保存ETag，并在过期后发送条件请求复用304"""
+    print("\n---------------测试异步条件请求---------------")
+    if not ASYNC_AVAILABLE:
+        print("未安装aiohttp，跳过")
+        return
+    cache = MemoryCache()
+    api = WeatherAPI(api_key="test", cache=cache)
+    key = api.cached_request('current', "Beijing", "metric").cache_key
+
+    async def call(base_url):
+        api.base_url = base_url
+        async with AsyncAPIClient(api) as client:
+            first = await client.get_current_weather("Beijing")
+            validators = cache.get(key + ':validators')
+            expire(cache, key)
+            second = await client.get_current_weather("Beijing")
+            return first, validators, second
+
+    (first, validators, second), seen = run_with_server([
+        (200, b'{"name": "Beijing"}', {'ETag': '"v1"'}),
+        (304, b'', {}),
+    ], call)
+    print(f"异步首次请求结果: {first}, 保存的验证信息: {validators}")
+    print(f"异步304请求结果: {second}, If-None-Match = {seen}")
+    print(f"异步304后缓存已刷新: {cache.get(key) is not None}")
+
+    print("\n搞定")
+
+if __name__ == "__main__":
+    test_memory_cache()
+    test_conditional_requests()
+    test_evicted_during_revalidation()
+    test_async_retry()
+    test_async_conditional_requests()
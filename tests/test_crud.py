@@ -5,6 +5,7 @@ Thus, the language is Chinese for author's convenience.
 """
 import sys
 import os
+import json
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -43,6 +44,40 @@ def test_crud_operations():
     )
     print(f"创建天气记录结果: 成功 = {success}, 结果 = {result}")
     
+    # 测试批量创建天气记录
+    print("\n测试批量创建天气记录...")
+    success, result = crud.bulk_create_weather_records(
+        location_id,
+        [
+            ("2025-04-20", 22.0, 21.5, 60, 2.0, "北风", "多云", "多云"),
+            ("2025-04-21", 23.5, 23.0, 55, 2.5, "东风", "晴", "晴朗"),
+            ("2025-04-22", 21.0, 20.0, 70, 4.0, "南风", "雨", "小雨"),
+        ]
+    )
+    print(f"批量创建天气记录结果: 成功 = {success}, 结果 = {result}")
+    
+    # 测试预报记录：新的预报覆盖旧的预报，但不覆盖实测记录
+    print("\n测试保存预报记录...")
+    crud.bulk_create_weather_records(location_id, [("2025-04-26", 18.0, None, None, None, None, "雨", "预报")], forecast=True)
+    success, result = crud.bulk_create_weather_records(
+        location_id,
+        [
+            ("2025-04-22", 30.0, None, None, None, None, "晴", "预报"),
+            ("2025-04-26", 19.0, None, None, None, None, "晴", "新预报"),
+        ],
+        forecast=True
+    )
+    observed = crud.get_weather_by_location_and_date(location_id, "2025-04-22")
+    forecast = crud.get_weather_by_location_and_date(location_id, "2025-04-26")
+    print(f"保存预报结果: 成功 = {success}, 写入 = {result}")
+    print(f"实测记录未被覆盖: {observed['temperature'] == 21.0 and not observed['is_forecast']}, 预报已更新: {forecast['temperature'] == 19.0 and forecast['is_forecast'] == 1}")
+    
+    success, result = crud.bulk_create_weather_records(location_id, [("2025-13-01", 20.0, None, None, None, None, None, None)])
+    print(f"无效日期批量创建结果: 成功 = {success}, 结果 = {result}")
+    
+    success, result = crud.create_weather_record(-1, "2025-04-23", 20.0)
+    print(f"不存在位置创建天气记录结果: 成功 = {success}, 结果 = {result}")
+    
     # 测试创建查询历史
     print("\n测试创建查询历史...")
     success, result = crud.create_query_history(
@@ -52,6 +87,16 @@ def test_crud_operations():
     )
     print(f"创建查询历史结果: 成功 = {success}, 结果 = {result}")
     
+    # 测试在一个事务中执行多个操作
+    print("\n测试在一个事务中执行多个操作...")
+    with crud.db_manager.transaction():
+        crud.create_weather_record(location_id, "2025-04-25", 24.0)
+        success, result = crud.create_query_history(location_id, "2025-04-23", "2025-04-25")
+        # 事务内的读取应能看到本事务尚未提交的写入
+        visible = crud.get_weather_by_location_and_date(location_id, "2025-04-25") is not None
+    print(f"事务提交结果: 成功 = {success}, 事务已结束 = {not crud.db_manager.conn.in_transaction}")
+    print(f"事务内读取未提交写入结果: {visible}")
+    
     print("\n---------------测试READ操作---------------")
     # 测试获取位置信息
     print("\n测试获取位置信息...")
@@ -68,11 +113,21 @@ def test_crud_operations():
     weather_range = crud.get_weather_by_date_range(location_id, "2025-04-20", "2025-04-25")
     print(f"获取日期范围内的天气记录结果: {weather_range}")
     
+    # 测试由SQLite直接生成JSON
+    print("\n测试由SQLite直接生成JSON...")
+    weather_json = crud.export_weather_json(location_id, "2025-04-20", "2025-04-25")
+    print(f"SQLite生成JSON与逐行读取一致: {json.loads(weather_json) == weather_range}")
+    
     # 测试获取所有天气记录
     print("\n测试获取所有天气记录...")
     all_weather = crud.get_all_weather_records()
     print(f"获取所有天气记录结果: {all_weather}")
     
+    # 测试逐条读取所有天气记录
+    print("\n测试逐条读取所有天气记录...")
+    streamed = list(crud.iter_all_weather_records())
+    print(f"逐条读取结果与一次性读取一致: {streamed == all_weather}")
+    
     # 测试获取查询历史
     print("\n测试获取查询历史...")
     history = crud.get_query_history()
@@ -81,9 +136,14 @@ def test_crud_operations():
     print("\n-------------测试UPDATE操作-------------")
     # 测试更新位置信息
     print("\n测试更新位置信息...")
+    crud.get_location_by_name("北京")  # 先读取一次，写入位置缓存
     success, message = crud.update_location(location_id, latitude=39.9, longitude=116.4)
     print(f"更新位置结果: 成功 = {success}, 消息 = {message}")
     
+    # 测试更新后按名称读取位置（缓存应已失效）
+    location = crud.get_location_by_name("北京")
+    print(f"更新后按名称读取位置结果: {location}")
+    
 
 
     # 测试更新天气记录
@@ -95,6 +155,9 @@ def test_crud_operations():
             humidity=70
         )
         print(f"更新天气记录结果: 成功 = {success}, 消息 = {message}")
+        
+        success, message = crud.update_weather_record(weather['id'], date="2025-4-23")
+        print(f"无效日期更新天气记录结果: 成功 = {success}, 消息 = {message}")
     
     print("\n--------------测试DELETE操作----------------")
     print("\n创建临时位置...")